@@ -0,0 +1,82 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Memory Report
+
+Compares the memory used by the plain-dictionary quest/item catalogs
+returned by game_data.load_quests/load_items with the slotted records
+from game_data.compact_quests/compact_items.
+
+Usage: python benchmarks/catalog_memory.py [record_count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+ITEM_TYPES = ["weapon", "armor", "consumable"]
+ITEM_EFFECTS = ["strength:5", "magic:8", "max_health:10", "health:20"]
+
+def build_dict_catalogs(count):
+    """Build synthetic catalogs the same way load_quests/load_items do"""
+    quests = {}
+    items = {}
+    for i in range(count):
+        quest_lines = [
+            f"QUEST_ID: quest_{i:07d}",
+            f"TITLE: Quest {i}",
+            f"DESCRIPTION: Synthetic quest number {i}",
+            f"REWARD_XP: {50 + i % 200}",
+            f"REWARD_GOLD: {25 + i % 100}",
+            f"REQUIRED_LEVEL: {1 + i % 20}",
+            f"PREREQUISITE: {'NONE' if i % 10 == 0 else f'quest_{i - 1:07d}'}",
+        ]
+        quest = game_data.build_quest(quest_lines)
+        quests[quest['quest_id']] = quest
+        
+        item_lines = [
+            f"ITEM_ID: item_{i:07d}",
+            f"NAME: Item {i}",
+            f"TYPE: {ITEM_TYPES[i % len(ITEM_TYPES)]}",
+            f"EFFECT: {ITEM_EFFECTS[i % len(ITEM_EFFECTS)]}",
+            f"COST: {10 + i % 500}",
+            f"DESCRIPTION: Synthetic item number {i}",
+        ]
+        item = game_data.build_item(item_lines)
+        items[item['item_id']] = item
+    return quests, items
+
+def measure(build):
+    """Return (result, bytes still allocated by build())"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def build_compact_catalogs(count):
+    """Build synthetic catalogs and convert them to slotted records"""
+    quests, items = build_dict_catalogs(count)
+    return game_data.compact_quests(quests), game_data.compact_items(items)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    
+    dict_catalogs, dict_bytes = measure(lambda: build_dict_catalogs(count))
+    del dict_catalogs
+    compact_catalogs, compact_bytes = measure(lambda: build_compact_catalogs(count))
+    del compact_catalogs
+    
+    print(f"=== CATALOG MEMORY ({count} quests + {count} items) ===")
+    print(f"{'Catalog':<12} {'Total MB':>10} {'Bytes/record':>14}")
+    print("-" * 38)
+    for label, total in (("dict", dict_bytes), ("compact", compact_bytes)):
+        print(f"{label:<12} {total / 1e6:>10.1f} {total / (2 * count):>14.0f}")
+    print(f"Saved: {100 * (1 - compact_bytes / dict_bytes):.1f}%")
+
+if __name__ == "__main__":
+    main()
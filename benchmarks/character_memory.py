@@ -0,0 +1,73 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Memory Report
+
+Compares the memory used by resident characters kept as the plain
+dictionaries returned by character_manager.load_character with the
+slotted records from character_manager.compact_character.
+
+Usage: python benchmarks/character_memory.py [character_count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+def build_dict_characters(count):
+    """Build synthetic characters the way load_character does"""
+    characters = []
+    for i in range(count):
+        lines = [
+            f"NAME: Hero{i}",
+            f"CLASS: {CLASSES[i % len(CLASSES)]}",
+            f"LEVEL: {1 + i % 50}",
+            f"HEALTH: {80 + i % 40}",
+            f"MAX_HEALTH: {120 + i % 40}",
+            f"STRENGTH: {10 + i % 20}",
+            f"MAGIC: {5 + i % 20}",
+            f"EXPERIENCE: {i % 1000}",
+            f"GOLD: {i % 5000}",
+            f"INVENTORY: health_potion,item_{i % 200:04d},item_{i % 37:04d}",
+            f"ACTIVE_QUESTS: quest_{i % 50:04d}",
+            f"COMPLETED_QUESTS: first_steps,quest_{i % 20:04d},quest_{i % 30:04d}",
+        ]
+        characters.append(character_manager._parse_save_lines(lines))
+    return characters
+
+def build_compact_characters(count):
+    """Build synthetic characters and convert them to slotted records"""
+    return [character_manager.compact_character(character)
+            for character in build_dict_characters(count)]
+
+def measure(build):
+    """Return (result, bytes still allocated by build())"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    
+    dict_characters, dict_bytes = measure(lambda: build_dict_characters(count))
+    del dict_characters
+    compact_characters, compact_bytes = measure(lambda: build_compact_characters(count))
+    del compact_characters
+    
+    print(f"=== CHARACTER MEMORY ({count} characters) ===")
+    print(f"{'Storage':<12} {'Total MB':>10} {'Bytes/char':>12}")
+    print("-" * 36)
+    for label, total in (("dict", dict_bytes), ("compact", compact_bytes)):
+        print(f"{label:<12} {total / 1e6:>10.1f} {total / count:>12.0f}")
+    print(f"Saved: {100 * (1 - compact_bytes / dict_bytes):.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Synthetic Data Generator
+
+Writes large quest/item catalogs and save files in the same text formats
+the game uses, for benchmarking game_data and character_manager at scale.
+Every quest's prerequisite is NONE or an earlier quest, so the generated
+prerequisite chains always resolve.
+
+Usage: python benchmarks/generate_data.py OUTPUT_DIR [quest_count] [item_count] [save_count]
+"""
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+ITEM_TYPES = ["weapon", "armor", "consumable"]
+TYPE_STATS = {
+    "weapon": ["strength", "magic"],
+    "armor": ["max_health"],
+    "consumable": ["health"],
+}
+CHARACTER_CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+def quest_id_for(index):
+    """Return the generated quest ID for a quest number"""
+    return f"quest_{index:07d}"
+
+def item_id_for(index):
+    """Return the generated item ID for an item number"""
+    return f"item_{index:07d}"
+
+def generate_quests(filename, count, seed=0):
+    """
+    Write `count` quests to filename
+    
+    Roughly one quest in five starts a new chain; the rest require a
+    random earlier quest. Required level grows along each chain.
+    
+    Returns: List of generated quest IDs
+    """
+    rng = random.Random(seed)
+    levels = []
+    quest_ids = []
+    
+    with open(filename, 'w') as f:
+        for i in range(count):
+            quest_id = quest_id_for(i)
+            if i == 0 or rng.random() < 0.2:
+                prerequisite = "NONE"
+                level = rng.randint(1, 5)
+            else:
+                parent = rng.randrange(i)
+                prerequisite = quest_ids[parent]
+                level = levels[parent] + rng.randint(0, 2)
+            
+            if i:
+                f.write("\n")
+            f.write(f"QUEST_ID: {quest_id}\n")
+            f.write(f"TITLE: Generated Quest {i}\n")
+            f.write(f"DESCRIPTION: Synthetic quest number {i} for benchmarking\n")
+            f.write(f"REWARD_XP: {rng.randint(10, 500)}\n")
+            f.write(f"REWARD_GOLD: {rng.randint(5, 250)}\n")
+            f.write(f"REQUIRED_LEVEL: {level}\n")
+            f.write(f"PREREQUISITE: {prerequisite}\n")
+            
+            quest_ids.append(quest_id)
+            levels.append(level)
+    
+    return quest_ids
+
+def generate_items(filename, count, seed=0):
+    """
+    Write `count` items to filename
+    
+    Returns: List of generated item IDs
+    """
+    rng = random.Random(seed)
+    item_ids = []
+    
+    with open(filename, 'w') as f:
+        for i in range(count):
+            item_id = item_id_for(i)
+            item_type = rng.choice(ITEM_TYPES)
+            stat = rng.choice(TYPE_STATS[item_type])
+            
+            if i:
+                f.write("\n")
+            f.write(f"ITEM_ID: {item_id}\n")
+            f.write(f"NAME: Generated Item {i}\n")
+            f.write(f"TYPE: {item_type}\n")
+            f.write(f"EFFECT: {stat}:{rng.randint(1, 50)}\n")
+            f.write(f"COST: {rng.randint(5, 1000)}\n")
+            f.write(f"DESCRIPTION: Synthetic item number {i} for benchmarking\n")
+            
+            item_ids.append(item_id)
+    
+    return item_ids
+
+def generate_saves(save_directory, count, quest_ids, item_ids, seed=0):
+    """
+    Write `count` save files referencing the given quests and items
+    
+    Returns: List of generated character names
+    """
+    rng = random.Random(seed)
+    names = []
+    
+    def characters():
+        for i in range(count):
+            name = f"Hero{i:07d}"
+            character = character_manager.create_character(name, rng.choice(CHARACTER_CLASSES))
+            character_manager.gain_experience(character, rng.randint(0, 5000))
+            character['gold'] = rng.randint(0, 10000)
+            
+            if item_ids:
+                character['inventory'] = rng.choices(item_ids, k=rng.randint(0, 10))
+            if quest_ids:
+                quests = rng.sample(quest_ids, min(len(quest_ids), rng.randint(0, 6)))
+                character['completed_quests'] = quests[:len(quests) // 2]
+                character['active_quests'] = quests[len(quests) // 2:]
+            
+            names.append(name)
+            yield character
+    
+    # Generated data is disposable, so skip per-file and directory fsyncs
+    character_manager.save_characters(characters(), save_directory, fsync=False)
+    return names
+
+def generate_dataset(output_directory, quest_count, item_count, save_count, seed=0):
+    """
+    Write quests.txt, items.txt and save_games/ under output_directory
+    
+    Returns: Dictionary of generated paths and character names
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    quests_path = os.path.join(output_directory, "quests.txt")
+    items_path = os.path.join(output_directory, "items.txt")
+    save_directory = os.path.join(output_directory, "save_games")
+    
+    quest_ids = generate_quests(quests_path, quest_count, seed)
+    item_ids = generate_items(items_path, item_count, seed)
+    names = generate_saves(save_directory, save_count, quest_ids, item_ids, seed)
+    
+    return {
+        "quests": quests_path,
+        "items": items_path,
+        "save_directory": save_directory,
+        "characters": names,
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+    
+    output = sys.argv[1]
+    quest_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    item_count = int(sys.argv[3]) if len(sys.argv) > 3 else quest_count
+    save_count = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+    
+    generate_dataset(output, quest_count, item_count, save_count)
+    print(f"Wrote {quest_count} quests, {item_count} items and {save_count} saves to {output}")
@@ -0,0 +1,72 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Parser Microbenchmark
+
+Times the text save parser (character_manager._parse_save_lines) against
+the bytes fast path (character_manager._parse_save_bytes) on the same
+in-memory save files, so disk speed doesn't hide the difference.
+
+Usage: python benchmarks/parse_benchmark.py [save_count] [repeat]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+def build_saves(count):
+    """Return `count` save files as bytes"""
+    saves = []
+    for i in range(count):
+        character = character_manager.create_character(f"Hero{i}", CLASSES[i % len(CLASSES)])
+        character['level'] = 1 + i % 50
+        character['gold'] = i % 5000
+        character['inventory'] = [f"item_{(i + j) % 200:04d}" for j in range(i % 8)]
+        character['completed_quests'] = [f"quest_{(i + j) % 50:04d}" for j in range(i % 5)]
+        saves.append(character_manager.format_save_data(character).encode("utf-8"))
+    return saves
+
+def parse_text(saves):
+    """Parse every save the way load_character did before the fast path"""
+    for data in saves:
+        character_manager._parse_save_lines(data.decode("utf-8").split("\n"))
+
+def parse_bytes(saves):
+    """Parse every save with the bytes fast path"""
+    for data in saves:
+        if character_manager._can_parse_bytes(data):
+            character_manager._parse_save_bytes(data)
+
+def best_time(func, saves, repeat):
+    """Return the fastest of `repeat` runs of func(saves), in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(saves)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    saves = build_saves(count)
+    
+    text_time = best_time(parse_text, saves, repeat)
+    bytes_time = best_time(parse_bytes, saves, repeat)
+    
+    print(f"=== SAVE PARSER ({count} saves, best of {repeat}) ===")
+    print(f"{'Parser':<12} {'Seconds':>10} {'Saves/sec':>12}")
+    print("-" * 36)
+    for label, elapsed in (("text", text_time), ("bytes", bytes_time)):
+        print(f"{label:<12} {elapsed:>10.3f} {count / elapsed:>12.0f}")
+    print(f"Speedup: {text_time / bytes_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Load/Parse Benchmark Runner
+
+Times game_data.load_quests, game_data.load_items (plain and from a warm
+compiled cache), character_manager.load_character and
+character_manager.list_saved_characters on generated datasets of
+increasing size and writes the results as JSON.
+
+With --baseline, each timing is compared against a stored run and the
+script exits with status 1 if any of them is slower by more than
+--threshold (a fraction, default 0.25 = 25%). It also exits with status 1,
+baseline or not, if loading a catalog from its cache is slower than
+parsing the text file.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000,10000 --output results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --update-baseline
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import character_manager
+from benchmarks.generate_data import generate_dataset
+
+# Cap on save files per dataset; saves are generated at size // 10
+MAX_SAVES = 2000
+
+# Number of characters load_character is timed over per run
+LOAD_SAMPLE = 100
+
+def best_time(func, repeat):
+    """Return the fastest of `repeat` runs of func(), in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def benchmark_size(size, repeat):
+    """
+    Generate a dataset with `size` quests and items and time the loaders
+    
+    Returns: Dictionary {benchmark_name: seconds}
+    """
+    workdir = tempfile.mkdtemp(prefix="qc_bench_")
+    try:
+        save_count = max(1, min(size // 10, MAX_SAVES))
+        dataset = generate_dataset(workdir, size, size, save_count)
+        save_directory = dataset["save_directory"]
+        sample = dataset["characters"][:LOAD_SAMPLE]
+        
+        def load_sample():
+            for name in sample:
+                character_manager.load_character(name, save_directory)
+        
+        # Write the compiled caches so the cached timings measure cache hits
+        game_data.load_quests(dataset["quests"], use_cache=True)
+        game_data.load_items(dataset["items"], use_cache=True)
+        
+        return {
+            "load_quests": best_time(lambda: game_data.load_quests(dataset["quests"]), repeat),
+            "load_items": best_time(lambda: game_data.load_items(dataset["items"]), repeat),
+            "load_quests_cached": best_time(
+                lambda: game_data.load_quests(dataset["quests"], use_cache=True), repeat
+            ),
+            "load_items_cached": best_time(
+                lambda: game_data.load_items(dataset["items"], use_cache=True), repeat
+            ),
+            "load_character": best_time(load_sample, repeat) / len(sample),
+            "list_saved_characters": best_time(
+                lambda: character_manager.list_saved_characters(save_directory), repeat
+            ),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def run(sizes, repeat):
+    """
+    Run every benchmark for every size
+    
+    Returns: JSON-serializable results dictionary
+    """
+    results = {}
+    for size in sizes:
+        for name, seconds in benchmark_size(size, repeat).items():
+            results.setdefault(name, {})[str(size)] = seconds
+    
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+def find_regressions(current, baseline, threshold):
+    """
+    Compare two result sets
+    
+    Returns: List of (benchmark, size, baseline_seconds, current_seconds)
+             for every timing slower than baseline * (1 + threshold)
+    """
+    regressions = []
+    for name, by_size in current["results"].items():
+        for size, seconds in by_size.items():
+            reference = baseline.get("results", {}).get(name, {}).get(size)
+            if reference is not None and seconds > reference * (1 + threshold):
+                regressions.append((name, size, reference, seconds))
+    return regressions
+
+def find_slow_caches(current):
+    """
+    Find catalogs that load slower from their compiled cache than from text
+    
+    Returns: List of (benchmark, size, plain_seconds, cached_seconds)
+    """
+    slow = []
+    results = current["results"]
+    for name in ("load_quests", "load_items"):
+        for size, cached in results.get(f"{name}_cached", {}).items():
+            plain = results.get(name, {}).get(size)
+            if plain is not None and cached > plain:
+                slow.append((name, size, plain, cached))
+    return slow
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark game data and save loading.")
+    parser.add_argument("--sizes", default="1000,10000",
+                        help="comma-separated catalog sizes (default: 1000,10000)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per benchmark; the fastest is kept (default: 3)")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs baseline as a fraction (default: 0.25)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="overwrite --baseline with this run instead of comparing")
+    args = parser.parse_args(argv)
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    current = run(sizes, args.repeat)
+    text = json.dumps(current, indent=2, sort_keys=True)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    
+    slow = find_slow_caches(current)
+    for name, size, plain, cached in slow:
+        print(f"REGRESSION {name} @ {size}: cached {cached:.6f}s is slower than "
+              f"plain {plain:.6f}s", file=sys.stderr)
+    
+    if not args.baseline:
+        return 1 if slow else 0
+    
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w') as f:
+            f.write(text + "\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 1 if slow else 0
+    
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    
+    regressions = find_regressions(current, baseline, args.threshold)
+    for name, size, reference, seconds in regressions:
+        print(f"REGRESSION {name} @ {size}: {reference:.6f}s -> {seconds:.6f}s "
+              f"(+{100 * (seconds / reference - 1):.0f}%)", file=sys.stderr)
+    return 1 if regressions or slow else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,18 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import re
+import sys
+import math
+import struct
+import hashlib
+import bisect
+import zlib
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -19,6 +31,46 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# Whether save_character fsyncs each save file and its directory before
+# returning. High-volume deployments can turn this off and rely on
+# save_characters() to batch the directory sync.
+FSYNC_SAVES = True
+
+# Where save files live inside the save directory:
+#   "flat"   - {save_directory}/{name}_save.txt
+#   "hashed" - {save_directory}/ab/cd/{name}_save.txt, where abcd... is the
+#              SHA-1 of the name; keeps directories small with millions of saves
+# Loads, deletes and listings understand both, so a directory can be moved
+# to the hashed layout with migrate_save_layout() while the game is running.
+SAVE_LAYOUT = "flat"
+SAVE_LAYOUTS = ("flat", "hashed")
+
+# Format written by save_character; loads detect the format of each file:
+#   "text"   - v1, the KEY: VALUE text format
+#   "binary" - v2, a checksummed header followed by the v1 text, zlib
+#              compressed when SAVE_COMPRESS is set
+SAVE_FORMAT = "text"
+SAVE_COMPRESS = True
+
+# v2 header: magic, format version, flags, payload length, payload CRC32
+SAVE_MAGIC = b"QCSV"
+SAVE_BINARY_VERSION = 2
+SAVE_FLAG_ZLIB = 0x01
+_SAVE_HEADER = struct.Struct(">4sBBII")
+
+# Save file keys holding integers and comma-separated lists
+SAVE_INT_FIELDS = ["LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"]
+SAVE_LIST_FIELDS = ["INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"]
+
+# Save file keys written only when the character has them; an empty value
+# loads as None (nothing equipped)
+SAVE_OPTIONAL_FIELDS = ["EQUIPPED_WEAPON", "EQUIPPED_ARMOR"]
+
+# Stat bonuses of the equipped items as stat:value pairs, written only when
+# the character has them. The saved stats already include them, so they're
+# needed to take the bonus off again when an item is unequipped after a load.
+SAVE_BONUS_FIELDS = ["WEAPON_BONUS", "ARMOR_BONUS"]
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -62,7 +114,7 @@ def create_character(name, character_class):
         "completed_quests": []
     }
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", fsync=None):
     """
     Save character to file
     
@@ -81,40 +133,55 @@ def save_character(character, save_directory="data/save_games"):
     INVENTORY: item1,item2,item3
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
+    EQUIPPED_WEAPON: item_id    (only if the character has these fields;
+    EQUIPPED_ARMOR: item_id      empty when nothing is equipped)
+    WEAPON_BONUS: strength:5    (stat bonuses of the equipped items, only
+    ARMOR_BONUS: max_health:10   while something is equipped)
+    
+    The save is written to a temporary file in the same directory and then
+    renamed over the old one, so a crash never leaves a truncated save.
+    
+    Args:
+        character: Character dictionary
+        save_directory: Directory containing save files
+        fsync: Flush the file and directory to disk before returning
+               (None = use FSYNC_SAVES)
+    
+    With SAVE_FORMAT = "binary" the same text is written behind a
+    versioned, checksummed header and optionally zlib compressed (see
+    encode_save_data); load_character reads either format.
+    
+    If a storage backend has been installed with set_storage_backend(),
+    the character is saved there instead and save_directory is ignored.
     
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
-    if not os.path.exists(save_directory):
-        os.makedirs(save_directory)
+    if _storage_backend is not None:
+        return _storage_backend.save(character)
+    return _save_text_character(character, save_directory, fsync)
+
+def save_characters(characters, save_directory="data/save_games", fsync=None):
+    """
+    Save many characters, syncing the save directory only once
     
-    filename = f"{character['name']}_save.txt"
-    filepath = os.path.join(save_directory, filename)
+    Each file is still written atomically (and fsynced if enabled); the
+    directory entry updates are flushed together at the end.
     
-    try:
-        with open(filepath, 'w') as file:
-            file.write(f"NAME: {character['name']}\n")
-            file.write(f"CLASS: {character['class']}\n")
-            file.write(f"LEVEL: {character['level']}\n")
-            file.write(f"HEALTH: {character['health']}\n")
-            file.write(f"MAX_HEALTH: {character['max_health']}\n")
-            file.write(f"STRENGTH: {character['strength']}\n")
-            file.write(f"MAGIC: {character['magic']}\n")
-            file.write(f"EXPERIENCE: {character['experience']}\n")
-            file.write(f"GOLD: {character['gold']}\n")
-            
-            inventory_str = ",".join(map(str, character['inventory']))
-            file.write(f"INVENTORY: {inventory_str}\n")
-            
-            active_str = ",".join(map(str, character['active_quests']))
-            file.write(f"ACTIVE_QUESTS: {active_str}\n")
-            
-            completed_str = ",".join(map(str, character['completed_quests']))
-            file.write(f"COMPLETED_QUESTS: {completed_str}\n")
-            
-        return True
-    except (PermissionError, IOError) as e:
-        raise e
+    Args:
+        characters: Iterable of character dictionaries
+        save_directory: Directory containing save files
+        fsync: Flush files and the directory to disk (None = use FSYNC_SAVES)
+    
+    With a storage backend installed, the batch is handed to its
+    save_many() instead.
+    
+    Returns: Number of characters saved
+    Raises: PermissionError, IOError
+    """
+    if _storage_backend is not None:
+        return _storage_backend.save_many(characters)
+    return _save_text_characters(characters, save_directory, fsync)
 
 def load_character(character_name, save_directory="data/save_games"):
     """
@@ -129,90 +196,103 @@ def load_character(character_name, save_directory="data/save_games"):
         CharacterNotFoundError if save file doesn't exist
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
+    
+    Reads from the installed storage backend, if any.
     """
-    filename = f"{character_name}_save.txt"
-    filepath = os.path.join(save_directory, filename)
+    if _storage_backend is not None:
+        return _storage_backend.load(character_name)
+    return _load_text_character(character_name, save_directory)
+
+def load_characters(names, save_directory="data/save_games", workers=8, progress=None):
+    """
+    Load many characters at once, collecting failures instead of stopping
     
-    if not os.path.exists(filepath):
-        raise CharacterNotFoundError(f"Character {character_name} not found.")
+    Saves are read on a thread pool so file (or database) reads overlap.
     
-    try:
-        with open(filepath, 'r') as file:
-            lines = file.readlines()
-    except (PermissionError, IOError) as e:
-        raise SaveFileCorruptedError(f"Could not read save file: {e}")
-
-    character = {}
-    int_fields = ["LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"]
-    list_fields = ["INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"]
+    Args:
+        names: Iterable of character names (duplicates are loaded once)
+        save_directory: Directory containing save files
+        workers: Thread pool size (1 = load one at a time)
+        progress: Optional callback progress(done, total), called after
+                  each character finishes loading
     
-    try:
-        for line in lines:
-            # tolerate blank or malformed lines
-            if ":" not in line:
-                continue
-
-            parts = line.split(":", 1)
-            if len(parts) < 2:
-                continue
-
-            key = parts[0].strip()
-            value = parts[1].strip()
-
-            key_upper = key.upper()
-            if key_upper in int_fields:
-                character[key.lower()] = int(value)
-            elif key_upper in list_fields:
-                if value:
-                    character[key.lower()] = [v for v in value.split(",") if v]
-                else:
-                    character[key.lower()] = []
-            else:
-                character[key.lower()] = value
-        
-        validate_character_data(character)
-        return character
-        
-    except (ValueError, IndexError) as e:
-        raise InvalidSaveDataError(f"Data format error: {e}")
+    Returns: Tuple of (characters, errors):
+             characters - {name: character} in the order of names
+             errors - {name: CharacterNotFoundError, SaveFileCorruptedError
+                       or InvalidSaveDataError instance}
+    """
+    names = list(dict.fromkeys(names))
+    total = len(names)
+    results = {}
+    errors = {}
+    
+    def load_one(name):
+        try:
+            return load_character(name, save_directory), None
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+            return None, e
+    
+    def record(name, outcome):
+        character, error = outcome
+        if error is None:
+            results[name] = character
+        else:
+            errors[name] = error
+        if progress is not None:
+            progress(len(results) + len(errors), total)
+    
+    if workers == 1 or total <= 1:
+        for name in names:
+            record(name, load_one(name))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(load_one, name): name for name in names}
+            for future in as_completed(futures):
+                record(futures[future], future.result())
+    
+    characters = {name: results[name] for name in names if name in results}
+    return characters, errors
 
 def list_saved_characters(save_directory="data/save_games"):
     """
     Get list of all saved character names
     
     Returns: List of character names (without _save.txt extension)
+    
+    Lists the installed storage backend, if any.
+    """
+    if _storage_backend is not None:
+        return _storage_backend.list_names()
+    return _list_text_characters(save_directory)
+
+def iter_saved_characters(save_directory="data/save_games"):
     """
-    if not os.path.exists(save_directory):
-        return []
+    Yield saved character names one at a time
     
-    saved_chars = []
-    try:
-        for filename in os.listdir(save_directory):
-            if filename.endswith("_save.txt"):
-                name = filename.replace("_save.txt", "")
-                saved_chars.append(name)
-        return saved_chars
-    except OSError:
-        return []
+    Unlike list_saved_characters, names are streamed from os.scandir as the
+    directory (and, for the hashed layout, its shard directories) is read,
+    so memory use doesn't grow with the number of saves. Order is
+    unspecified.
+    
+    Yields: Character names
+    """
+    if _storage_backend is not None:
+        yield from _storage_backend.list_names()
+        return
+    yield from _iter_text_characters(save_directory)
 
 def delete_character(character_name, save_directory="data/save_games"):
     """
     Delete a character's save file
     
+    Deletes from the installed storage backend, if any.
+    
     Returns: True if deleted successfully
     Raises: CharacterNotFoundError if character doesn't exist
     """
-    filename = f"{character_name}_save.txt"
-    filepath = os.path.join(save_directory, filename)
-    
-    if not os.path.exists(filepath):
-        raise CharacterNotFoundError(f"Character {character_name} not found.")
-    
-    try:
-        os.remove(filepath)
-        return True
-    except OSError as e:
-        raise e
+    if _storage_backend is not None:
+        return _storage_backend.delete(character_name)
+    return _delete_text_character(character_name, save_directory)
 
 # ============================================================================
 # CHARACTER OPERATIONS
@@ -230,20 +310,70 @@ def gain_experience(character, xp_amount):
     - Increase magic by 2
     - Restore health to max_health
     
+    The number of levels gained is computed directly from the XP curve,
+    so large grants cost the same as small ones.
+    
+    Returns: Dictionary with 'levels_gained', 'level' and 'experience'
     Raises: CharacterDeadError if character health is 0
     """
     if character['health'] <= 0:
         raise CharacterDeadError("Character is dead and cannot gain experience.")
     
     character['experience'] += xp_amount
+    levels, xp_spent = levels_for_experience(character['level'], character['experience'])
     
-    while character['experience'] >= character['level'] * 100:
-        character['experience'] -= character['level'] * 100
-        character['level'] += 1
-        character['max_health'] += 10
-        character['strength'] += 2
-        character['magic'] += 2
+    if levels:
+        character['experience'] -= xp_spent
+        character['level'] += levels
+        character['max_health'] += 10 * levels
+        character['strength'] += 2 * levels
+        character['magic'] += 2 * levels
         character['health'] = character['max_health']
+    
+    return {
+        "levels_gained": levels,
+        "level": character['level'],
+        "experience": character['experience']
+    }
+
+def levels_for_experience(level, experience):
+    """
+    Work out how many level ups a pool of experience pays for
+    
+    Going from level L to L+1 costs L * 100 XP, so k level ups from level L
+    cost 100 * (k*L + k*(k-1)/2). For integer inputs at level 1 or above
+    the largest affordable k comes from the quadratic formula; anything
+    else falls back to stepping one level at a time.
+    
+    Args:
+        level: Current level
+        experience: Experience available
+    
+    Returns: Tuple of (levels_gained, xp_spent)
+    """
+    if not (isinstance(level, int) and isinstance(experience, int)) or level < 1:
+        levels = 0
+        xp_spent = 0
+        while experience - xp_spent >= (level + levels) * 100:
+            xp_spent += (level + levels) * 100
+            levels += 1
+        return levels, xp_spent
+    
+    if experience < level * 100:
+        return 0, 0
+    
+    def cost(k):
+        return k * level + k * (k - 1) // 2
+    
+    budget = experience // 100
+    b = 2 * level - 1
+    levels = (math.isqrt(b * b + 8 * budget) - b) // 2
+    while cost(levels + 1) <= budget:
+        levels += 1
+    while cost(levels) > budget:
+        levels -= 1
+    
+    return levels, 100 * cost(levels)
 
 def add_gold(character, amount):
     """
@@ -300,6 +430,209 @@ def revive_character(character):
     character['health'] = character['max_health'] // 2
     return True
 
+# ============================================================================
+# COMPACT CHARACTERS
+# ============================================================================
+
+class Character(MutableMapping):
+    """
+    Slotted character record for large resident populations
+    
+    Supports the same character['gold'] / 'equipped_weapon' in character /
+    del character['weapon_bonus'] access as the dictionaries returned by
+    create_character and load_character, so inventory_system, quest_handler
+    and combat_system work on it unchanged. Fields live in __slots__
+    instead of a per-character dict; the equipment fields are optional
+    and only appear once they have been set.
+    """
+    __slots__ = ("name", "class", "level", "health", "max_health",
+                 "strength", "magic", "experience", "gold", "inventory",
+                 "active_quests", "completed_quests", "equipped_weapon",
+                 "equipped_armor", "weapon_bonus", "armor_bonus")
+    _FIELDS = frozenset(__slots__)
+    
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            self[key] = value
+    
+    @classmethod
+    def from_dict(cls, character):
+        """
+        Build a Character from a character dictionary
+        
+        The name, class, item IDs and quest IDs are interned so characters
+        holding the same items and quests share one copy of each string.
+        Lists are copied; keys outside the character format are dropped.
+        """
+        record = cls()
+        for key, value in character.items():
+            if key not in cls._FIELDS:
+                continue
+            if isinstance(value, str):
+                value = sys.intern(value)
+            elif isinstance(value, list):
+                value = [sys.intern(entry) if isinstance(entry, str) else entry
+                         for entry in value]
+            setattr(record, key, value)
+        return record
+    
+    def __getitem__(self, key):
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key, value):
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __delitem__(self, key):
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __iter__(self):
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def __repr__(self):
+        return f"Character({self.to_dict()!r})"
+    
+    def to_dict(self):
+        """Return the character as a plain dictionary"""
+        return {key: getattr(self, key) for key in self}
+
+def compact_character(character):
+    """
+    Convert a character dictionary to a slotted Character
+    
+    Args:
+        character: Character dictionary (or Character)
+    
+    Returns: Character
+    """
+    return Character.from_dict(character)
+
+# ============================================================================
+# CHARACTER SNAPSHOTS
+# ============================================================================
+
+# id(list) -> number of live snapshots sharing that list object
+_shared_lists = {}
+
+class CharacterSnapshot:
+    """
+    Cheap, restorable copy of a character's state for what-if trials
+    
+    Taking a snapshot copies only the top-level fields; the inventory and
+    quest lists are shared with the character rather than copied. Code
+    that changes a character's list in place calls unshare_list() first,
+    which gives the character its own copy the first time a shared list
+    is changed (copy-on-write), so the snapshot's lists never change.
+    restore() can then put the character back by reassigning its fields.
+    
+    Used as a context manager, the character is restored and the snapshot
+    released on exit unless commit() was called:
+    
+        with snapshot_character(character) as snapshot:
+            inventory_system.purchase_item(character, item_id, item_data)
+            ...  # measure the result; the purchase is undone on exit
+    """
+    __slots__ = ("character", "state", "_released")
+    
+    def __init__(self, character):
+        self.character = character
+        self.state = dict(character.items())
+        self._released = False
+        for value in self.state.values():
+            if isinstance(value, list):
+                _shared_lists[id(value)] = _shared_lists.get(id(value), 0) + 1
+    
+    def restore(self):
+        """
+        Put the character back to the snapshot's state
+        
+        The snapshot stays usable, so one snapshot can back many trials.
+        
+        Raises: ValueError if the snapshot was released
+        """
+        if self._released:
+            raise ValueError("Snapshot has been released.")
+        character = self.character
+        state = self.state
+        if type(character) is dict:
+            character.clear()
+            character.update(state)
+            return
+        for key in [key for key in character if key not in state]:
+            del character[key]
+        for key, value in state.items():
+            character[key] = value
+    
+    def release(self):
+        """Stop sharing lists with the character; the snapshot can't be restored"""
+        if self._released:
+            return
+        self._released = True
+        for value in self.state.values():
+            if isinstance(value, list):
+                count = _shared_lists.pop(id(value)) - 1
+                if count:
+                    _shared_lists[id(value)] = count
+    
+    def commit(self):
+        """Keep the character's current state (same as release())"""
+        self.release()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if not self._released:
+            self.restore()
+            self.release()
+        return False
+    
+    def __del__(self):
+        self.release()
+
+def snapshot_character(character):
+    """
+    Take a copy-on-write snapshot of a character
+    
+    Args:
+        character: Character dictionary (or Character)
+    
+    Returns: CharacterSnapshot (see its docstring for restore/commit)
+    """
+    return CharacterSnapshot(character)
+
+def unshare_list(character, field):
+    """
+    Get a character's list field, ready to be changed in place
+    
+    If the list is shared with a live snapshot, the character gets its
+    own copy first. Call this instead of character[field] before
+    appending to or removing from inventory or quest lists.
+    
+    Returns: The list stored in character[field]
+    """
+    values = character[field]
+    if id(values) in _shared_lists:
+        values = list(values)
+        character[field] = values
+    return values
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -337,6 +670,1256 @@ def validate_character_data(character):
             
     return True
 
+# ============================================================================
+# STORAGE BACKENDS
+# ============================================================================
+
+class TextFileBackend:
+    """
+    Default storage: one {character_name}_save.txt file per character
+    
+    Backends provide save, save_many, load, list_names and delete. This
+    one wraps the text-file functions so it can be used explicitly, e.g.
+    as the source or destination of character_store.migrate_storage().
+    """
+    
+    def __init__(self, save_directory="data/save_games", fsync=None):
+        self.save_directory = save_directory
+        self.fsync = fsync
+    
+    def save(self, character):
+        """Save one character; returns True"""
+        return _save_text_character(character, self.save_directory, self.fsync)
+    
+    def save_many(self, characters):
+        """Save many characters; returns the number saved"""
+        return _save_text_characters(characters, self.save_directory, self.fsync)
+    
+    def load(self, character_name):
+        """Load one character dictionary"""
+        return _load_text_character(character_name, self.save_directory)
+    
+    def list_names(self, limit=None, after=None):
+        """
+        List saved character names in sorted order
+        
+        Args:
+            limit: Maximum number of names to return (None = all)
+            after: Only return names sorting after this one (for paging)
+        """
+        names = sorted(_list_text_characters(self.save_directory))
+        if after is not None:
+            names = names[bisect.bisect_right(names, after):]
+        if limit is not None:
+            names = names[:limit]
+        return names
+    
+    def delete(self, character_name):
+        """Delete one character; returns True"""
+        return _delete_text_character(character_name, self.save_directory)
+
+# Backend used by save_character/load_character/list_saved_characters/
+# delete_character; None means text files in the save_directory argument
+_storage_backend = None
+
+def set_storage_backend(backend):
+    """
+    Route character saves to a storage backend
+    
+    Args:
+        backend: Object with save, save_many, load, list_names and delete
+                 methods (e.g. character_store.SQLiteBackend), or None to
+                 go back to text files
+    
+    Returns: The previously installed backend
+    """
+    global _storage_backend
+    previous = _storage_backend
+    _storage_backend = backend
+    return previous
+
+def get_storage_backend():
+    """Return the installed storage backend, or None for text files"""
+    return _storage_backend
+
+def _save_text_character(character, save_directory, fsync):
+    """Text-file implementation of save_character"""
+    if fsync is None:
+        fsync = FSYNC_SAVES
+    
+    filepath = _save_path(character['name'], save_directory)
+    _make_save_directory(os.path.dirname(filepath), save_directory, fsync)
+    
+    try:
+        _write_atomic(filepath, encode_save_data(character), fsync)
+        if fsync:
+            _fsync_directory(os.path.dirname(filepath))
+        _remove_superseded(character['name'], save_directory, filepath, fsync)
+        return True
+    except (PermissionError, IOError) as e:
+        raise e
+
+def _save_text_characters(characters, save_directory, fsync):
+    """Text-file implementation of save_characters"""
+    if fsync is None:
+        fsync = FSYNC_SAVES
+    
+    written = []
+    directories = set()
+    for character in characters:
+        filepath = _save_path(character['name'], save_directory)
+        directory = os.path.dirname(filepath)
+        if directory not in directories:
+            _make_save_directory(directory, save_directory, fsync)
+            directories.add(directory)
+        _write_atomic(filepath, encode_save_data(character), fsync)
+        written.append((character['name'], filepath))
+    
+    if fsync:
+        for directory in directories:
+            _fsync_directory(directory)
+    # Only once the new saves are durable, so a crash can't lose both copies
+    for name, filepath in written:
+        _remove_superseded(name, save_directory, filepath, fsync)
+    return len(written)
+
+def _load_text_character(character_name, save_directory):
+    """Text-file implementation of load_character"""
+    character, journal_entries = _read_text_character(character_name, save_directory)
+    return character
+
+def _read_text_character(character_name, save_directory):
+    """
+    Load a text save plus any journal entries recorded on top of it
+    
+    Returns: Tuple of (character, number_of_journal_entries_replayed), with
+             None for the count if no journal applies to the save
+    Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+    """
+    filepath = _find_save_path(character_name, save_directory)
+    
+    if filepath is None:
+        raise CharacterNotFoundError(f"Character {character_name} not found.")
+    return _read_save_file(filepath, character_name)
+
+def _read_save_file(filepath, character_name):
+    """
+    Read, parse and validate one save file plus its journal
+    
+    Returns: Tuple of (character, number_of_journal_entries_replayed), with
+             None for the count if no journal applies to the save
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            data = file.read()
+    except (PermissionError, IOError) as e:
+        raise SaveFileCorruptedError(f"Could not read save file: {e}")
+    
+    payload = _save_payload(data)
+    fast_path = _can_parse_bytes(payload)
+    if not fast_path:
+        content = _decode_save_payload(payload)
+    
+    try:
+        if fast_path:
+            character = _parse_save_bytes(payload)
+            snapshot_crc = zlib.crc32(payload)
+        else:
+            character = _parse_save_lines(content.split("\n"))
+            snapshot_crc = zlib.crc32(content.encode())
+        journal_entries = _replay_journal(
+            character, _journal_path(character_name, None, filepath),
+            snapshot_crc
+        )
+        validate_character_data(character)
+        return character, journal_entries
+        
+    except (ValueError, IndexError) as e:
+        raise InvalidSaveDataError(f"Data format error: {e}")
+
+def _parse_save_lines(lines):
+    """
+    Parse KEY: VALUE save file lines into a character dictionary
+    
+    Raises: ValueError if a numeric field isn't an integer
+    """
+    character = {}
+    for line in lines:
+        # tolerate blank or malformed lines
+        if ":" not in line:
+            continue
+
+        parts = line.split(":", 1)
+        if len(parts) < 2:
+            continue
+
+        key = parts[0].strip()
+        value = parts[1].strip()
+
+        key_upper = key.upper()
+        if key_upper in SAVE_INT_FIELDS:
+            character[key.lower()] = int(value)
+        elif key_upper in SAVE_LIST_FIELDS:
+            if value:
+                character[key.lower()] = [v for v in value.split(",") if v]
+            else:
+                character[key.lower()] = []
+        elif key_upper in SAVE_OPTIONAL_FIELDS:
+            character[key.lower()] = value or None
+        elif key_upper in SAVE_BONUS_FIELDS:
+            character[key.lower()] = _parse_bonus(value)
+        else:
+            character[key.lower()] = value
+    return character
+
+def _parse_save_bytes(data):
+    """
+    Fast path of _parse_save_lines for save file bytes
+    
+    Splits fields with bytes.partition and looks keys up in the
+    _SAVE_FIELD_KINDS dispatch table instead of upper-casing and searching
+    the field lists on every line. Only valid where _can_parse_bytes(data)
+    is True; there it returns exactly what _parse_save_lines would, and
+    raises the same errors.
+    
+    Raises: ValueError if a numeric field isn't an integer
+    """
+    character = {}
+    kinds = _SAVE_FIELD_KINDS
+    for line in data.split(b"\n"):
+        key, sep, value = line.partition(b":")
+        if not sep:
+            continue
+        
+        entry = kinds.get(key)
+        if entry is None:
+            entry = kinds.get(key.strip().upper())
+            if entry is None:
+                character[key.strip().decode("ascii").lower()] = value.strip().decode("ascii")
+                continue
+        
+        field, kind = entry
+        if kind == _INT_FIELD:
+            try:
+                character[field] = int(value)
+            except ValueError:
+                # re-parse as str so the message matches the text parser
+                character[field] = int(value.strip().decode("ascii"))
+        elif kind == _LIST_FIELD:
+            values = value.strip().decode("ascii").split(",")
+            if "" in values:
+                values = [v for v in values if v]
+            character[field] = values
+        elif kind == _OPTIONAL_FIELD:
+            character[field] = value.strip().decode("ascii") or None
+        elif kind == _BONUS_FIELD:
+            character[field] = _parse_bonus(value.strip().decode("ascii"))
+        else:
+            character[field] = value.strip().decode("ascii")
+    return character
+
+# Field kinds for _parse_save_bytes
+_INT_FIELD, _LIST_FIELD, _STR_FIELD, _OPTIONAL_FIELD, _BONUS_FIELD = range(5)
+
+# Upper-case save key -> (character field, field kind)
+_SAVE_FIELD_KINDS = {key.encode("ascii"): (key.lower(), _INT_FIELD) for key in SAVE_INT_FIELDS}
+_SAVE_FIELD_KINDS.update(
+    (key.encode("ascii"), (key.lower(), _LIST_FIELD)) for key in SAVE_LIST_FIELDS
+)
+_SAVE_FIELD_KINDS.update(
+    (key.encode("ascii"), (key.lower(), _STR_FIELD)) for key in ("NAME", "CLASS")
+)
+_SAVE_FIELD_KINDS.update(
+    (key.encode("ascii"), (key.lower(), _OPTIONAL_FIELD)) for key in SAVE_OPTIONAL_FIELDS
+)
+_SAVE_FIELD_KINDS.update(
+    (key.encode("ascii"), (key.lower(), _BONUS_FIELD)) for key in SAVE_BONUS_FIELDS
+)
+
+# Bytes that str.strip() treats as whitespace but bytes.strip() doesn't,
+# plus carriage returns (normalised by the text path)
+_TEXT_ONLY_BYTES = re.compile(rb"[\r\x1c-\x1f]")
+
+def _can_parse_bytes(data):
+    """Return True if _parse_save_bytes gives the same result as the text parser"""
+    return data.isascii() and _TEXT_ONLY_BYTES.search(data) is None
+
+def _list_text_characters(save_directory):
+    """
+    Text-file implementation of list_saved_characters
+    
+    A save found in both layouts (e.g. mid-migration) is listed once.
+    """
+    return list(dict.fromkeys(_iter_text_characters(save_directory)))
+
+def _iter_text_characters(save_directory, depth=0):
+    """
+    Text-file implementation of iter_saved_characters
+    
+    Reads the top level (flat layout) and up to two levels of shard
+    directories (hashed layout) with os.scandir. A name is yielded once
+    per layout it's saved in; saving removes the other layout's copy, so
+    that only happens mid-migration or after a crash.
+    """
+    try:
+        entries = os.scandir(save_directory)
+    except OSError:
+        return
+    
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith("_save.txt"):
+                yield name[:-len("_save.txt")]
+            elif depth < 2 and len(name) == 2 and entry.is_dir(follow_symlinks=False):
+                yield from _iter_text_characters(entry.path, depth + 1)
+
+def _delete_text_character(character_name, save_directory):
+    """Text-file implementation of delete_character"""
+    filepaths = [
+        path for path in (_save_path(character_name, save_directory, layout)
+                          for layout in SAVE_LAYOUTS)
+        if os.path.exists(path)
+    ]
+    
+    if not filepaths:
+        raise CharacterNotFoundError(f"Character {character_name} not found.")
+    
+    try:
+        for filepath in filepaths:
+            os.remove(filepath)
+            journal_path = _journal_path(character_name, save_directory, filepath)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+        return True
+    except OSError as e:
+        raise e
+
+def _remove_superseded(character_name, save_directory, filepath, fsync):
+    """
+    Remove what a just-written full save replaces: the journal next to it
+    and copies of the save (and their journals) in other layouts
+    
+    A journal left next to the new save would be replayed on top of it
+    whenever the new save's text matches the journal's BASE snapshot (e.g.
+    gold +50 journaled, then the 50 spent and saved in full). An old copy
+    in another layout would be listed twice and loaded again if the layout
+    is switched back.
+    """
+    stale = [_journal_path(character_name, None, filepath)]
+    for layout in SAVE_LAYOUTS:
+        other = _save_path(character_name, save_directory, layout)
+        if other != filepath:
+            stale += [other, _journal_path(character_name, None, other)]
+    
+    directories = set()
+    for path in stale:
+        try:
+            os.remove(path)
+            directories.add(os.path.dirname(path))
+        except FileNotFoundError:
+            pass
+    if fsync:
+        for directory in directories:
+            _fsync_directory(directory)
+
+def migrate_save_layout(save_directory="data/save_games", layout="hashed", fsync=None):
+    """
+    Move every text save (and its journal) into the given layout
+    
+    Safe to run while the game is using the directory: each save is moved
+    with a single atomic rename and loads look in both layouts. A save
+    with a journal is rewritten in full at its new location before the
+    old save and journal are removed, so a reader never sees the save
+    without its journal. If a save already exists at the new location
+    (written by the game mid-migration) it is newer and the old copy is
+    dropped.
+    
+    Args:
+        save_directory: Directory containing save files
+        layout: Target layout, "flat" or "hashed"
+        fsync: Flush moves to disk (None = use FSYNC_SAVES)
+    
+    Returns: Number of characters moved
+    Raises: ValueError for an unknown layout
+    """
+    if layout not in SAVE_LAYOUTS:
+        raise ValueError(f"Unknown save layout: {layout}")
+    if fsync is None:
+        fsync = FSYNC_SAVES
+    
+    moved = 0
+    for name in _iter_text_characters(save_directory):
+        target = _save_path(name, save_directory, layout)
+        for source_layout in SAVE_LAYOUTS:
+            source = _save_path(name, save_directory, source_layout)
+            if source == target or not os.path.exists(source):
+                continue
+            
+            source_journal = _journal_path(name, save_directory, source)
+            if os.path.exists(target):
+                pass
+            elif os.path.exists(source_journal):
+                character, _ = _read_text_character(name, save_directory)
+                _make_save_directory(os.path.dirname(target), save_directory, fsync)
+                _write_atomic(target, encode_save_data(character), fsync)
+            else:
+                _make_save_directory(os.path.dirname(target), save_directory, fsync)
+                try:
+                    os.replace(source, target)
+                except FileNotFoundError:
+                    continue        # saved to the new layout meanwhile, old copy removed
+            
+            for path in (source, source_journal):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            if fsync:
+                _fsync_directory(os.path.dirname(target))
+                _fsync_directory(os.path.dirname(source))
+            moved += 1
+    return moved
+
+# ============================================================================
+# BACKGROUND SAVING
+# ============================================================================
+
+class AsyncSaveWriter:
+    """
+    Write character saves on a background thread
+    
+    save() takes a snapshot of the character and returns immediately;
+    a worker thread writes snapshots with save_character(). If a character
+    is queued again before its previous snapshot was written, only the
+    latest state is kept, so bursts of autosaves cost one write.
+    
+    When max_pending characters are waiting, save() blocks until the
+    worker catches up (backpressure). Call flush() to wait for all queued
+    saves and close() when shutting down.
+    """
+    
+    def __init__(self, save_directory="data/save_games", max_pending=100, fsync=None):
+        """
+        Start the writer thread
+        
+        Args:
+            save_directory: Passed to save_character
+            max_pending: Most distinct characters that may wait to be written
+            fsync: Passed to save_character (None = use FSYNC_SAVES)
+        """
+        self.save_directory = save_directory
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self.written = 0
+        self.coalesced = 0
+        
+        self._pending = OrderedDict()
+        self._in_flight = 0
+        self._errors = []
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._thread.start()
+    
+    def save(self, character, timeout=None):
+        """
+        Queue a snapshot of character to be saved
+        
+        Args:
+            character: Character dictionary (later changes aren't included)
+            timeout: Seconds to wait if the queue is full (None = forever)
+        
+        Returns: True if queued, False if the queue stayed full past timeout
+        Raises: RuntimeError if the writer has been closed
+        """
+        snapshot = _snapshot_for_save(character)
+        name = snapshot['name']
+        
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Save writer is closed.")
+            
+            if name in self._pending:
+                self._pending[name] = snapshot
+                self.coalesced += 1
+                return True
+            
+            has_room = self._condition.wait_for(
+                lambda: len(self._pending) < self.max_pending or self._closed, timeout
+            )
+            if not has_room:
+                return False
+            if self._closed:
+                raise RuntimeError("Save writer is closed.")
+            
+            self._pending[name] = snapshot
+            self._condition.notify_all()
+        return True
+    
+    def flush(self, timeout=None):
+        """
+        Wait until every queued save has been written
+        
+        Returns: True if flushed, False if timeout expired first
+        Raises: The first error a background save hit since the last
+                flush (usually IOError/PermissionError)
+        """
+        with self._condition:
+            done = self._condition.wait_for(
+                lambda: not self._pending and self._in_flight == 0, timeout
+            )
+            errors = self._errors
+            self._errors = []
+        
+        if errors:
+            raise errors[0]
+        return done
+    
+    def close(self, timeout=None):
+        """Write everything still queued, then stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        self.flush(0)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _run(self):
+        """Worker loop: write the oldest pending snapshot until closed and drained"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                name, snapshot = self._pending.popitem(last=False)
+                self._in_flight += 1
+                self._condition.notify_all()
+            
+            error = None
+            try:
+                save_character(snapshot, self.save_directory, self.fsync)
+            except Exception as e:
+                # Keep the worker alive (flush() waits on it) and report
+                # anything, e.g. a KeyError from a malformed character
+                error = e
+            
+            with self._condition:
+                if error is None:
+                    self.written += 1
+                else:
+                    self._errors.append(error)
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+def _snapshot_for_save(character):
+    """Copy a character so later in-game changes don't leak into a queued save"""
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in character.items()
+    }
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+class CharacterCache:
+    """
+    In-memory LRU cache in front of load_character/save_character
+    
+    get() returns the cached character, loading it on a miss. put() stores
+    a character and marks it dirty; dirty characters are written back with
+    save_character() when evicted, on flush() and on close(). Clean entries
+    whose save file's mtime changed on disk are dropped and reloaded.
+    
+    Counters: hits, misses, evictions, writebacks, invalidations.
+    """
+    
+    def __init__(self, max_size=1000, save_directory="data/save_games", fsync=None):
+        """
+        Args:
+            max_size: Most characters kept in memory
+            save_directory: Passed to load_character/save_character
+            fsync: Passed to save_character (None = use FSYNC_SAVES)
+        """
+        self.max_size = max_size
+        self.save_directory = save_directory
+        self.fsync = fsync
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.invalidations = 0
+        
+        # name -> [character, save_file_mtime, dirty]
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def get(self, character_name):
+        """
+        Get a character, loading it if it isn't cached (or went stale)
+        
+        Returns: Character dictionary (shared with the cache; call put()
+                 after changing it)
+        Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+        """
+        with self._lock:
+            entry = self._entries.get(character_name)
+            if entry is not None:
+                character, mtime, dirty = entry
+                if dirty or self._save_mtime(character_name) == mtime:
+                    self._entries.move_to_end(character_name)
+                    self.hits += 1
+                    return character
+                del self._entries[character_name]
+                self.invalidations += 1
+            
+            self.misses += 1
+            character = load_character(character_name, self.save_directory)
+            self._insert(character_name, [character, self._save_mtime(character_name), False])
+            return character
+    
+    def put(self, character):
+        """Cache a character and mark it to be written back later"""
+        with self._lock:
+            self._insert(character['name'], [character, None, True])
+    
+    def invalidate(self, character_name):
+        """Drop a character from the cache without writing it back"""
+        with self._lock:
+            if self._entries.pop(character_name, None) is not None:
+                self.invalidations += 1
+    
+    def flush(self):
+        """
+        Write back every dirty character
+        
+        Returns: Number of characters written
+        Raises: PermissionError, IOError
+        """
+        with self._lock:
+            written = 0
+            for name, entry in self._entries.items():
+                if entry[2]:
+                    self._write_back(name, entry)
+                    written += 1
+            return written
+    
+    def close(self):
+        """Write back dirty characters and empty the cache"""
+        with self._lock:
+            self.flush()
+            self._entries.clear()
+    
+    def stats(self):
+        """Return the cache counters as a dictionary"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "writebacks": self.writebacks,
+                "invalidations": self.invalidations,
+            }
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, character_name):
+        return character_name in self._entries
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _insert(self, name, entry):
+        """
+        Add or replace an entry, evicting least recently used ones
+        
+        A dirty entry is only dropped once it has been written back, so if
+        the save fails it stays cached (and dirty) and the error propagates.
+        """
+        self._entries[name] = entry
+        self._entries.move_to_end(name)
+        while len(self._entries) > self.max_size:
+            old_name, old_entry = next(iter(self._entries.items()))
+            if old_entry[2]:
+                self._write_back(old_name, old_entry)
+            del self._entries[old_name]
+            self.evictions += 1
+    
+    def _write_back(self, name, entry):
+        """Save a dirty entry and remember the new file mtime"""
+        save_character(entry[0], self.save_directory, self.fsync)
+        entry[1] = self._save_mtime(name)
+        entry[2] = False
+        self.writebacks += 1
+    
+    def _save_mtime(self, name):
+        """Return the save file's mtime, or None if there's no file to watch"""
+        if _storage_backend is not None:
+            return None
+        try:
+            return os.stat(_find_save_path(name, self.save_directory)).st_mtime_ns
+        except OSError:
+            return None
+
+# ============================================================================
+# JOURNALED SAVING
+# ============================================================================
+
+class CharacterJournal:
+    """
+    Persist characters as a snapshot plus an append-only change log
+    
+    Instead of rewriting the whole save on every autosave, save() appends
+    only what changed since the last save to {name}_journal.log, e.g.:
+    
+        BASE 1a2b3c4d
+        GOLD +50
+        INVENTORY +health_potion
+        COMPLETED_QUESTS +first_steps
+        LEVEL +1
+    
+    After compact_after entries the log is folded into a fresh
+    {name}_save.txt snapshot. load_character() replays the log tail on top
+    of the snapshot automatically. The BASE line holds the CRC32 of the
+    snapshot the log applies to, so a log left behind by a crash during
+    compaction is ignored rather than replayed twice. A full save with
+    save_character() deletes the journal, since the new save already
+    includes everything in it.
+    
+    Journaling writes text files directly and ignores any installed
+    storage backend.
+    """
+    
+    def __init__(self, save_directory="data/save_games", compact_after=50, fsync=None):
+        """
+        Args:
+            save_directory: Directory containing save and journal files
+            compact_after: Journal entries allowed before writing a snapshot
+            fsync: Flush appends and snapshots to disk (None = use FSYNC_SAVES)
+        """
+        self.save_directory = save_directory
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self._bases = {}
+    
+    def load(self, character_name):
+        """
+        Load a character (snapshot plus journal) and track it for save()
+        
+        Returns: Character dictionary
+        Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+        """
+        character, entries = _read_text_character(character_name, self.save_directory)
+        filepath = _find_save_path(character_name, self.save_directory)
+        if filepath != _save_path(character_name, self.save_directory):
+            # save() appends next to the current layout's save; snapshot there first
+            entries = None
+        self._bases[character_name] = (_snapshot_for_save(character), entries)
+        return character
+    
+    def save(self, character):
+        """
+        Append the character's changes since the last load/save
+        
+        Characters not loaded through this journal, loaded from a save with
+        no journal (or a stale one), or past compact_after entries get a
+        full snapshot instead, so appends always follow a matching BASE.
+        
+        Returns: Number of journal entries appended (0 after a snapshot)
+        Raises: PermissionError, IOError
+        """
+        name = character['name']
+        base = self._bases.get(name)
+        if base is None:
+            self.compact(character)
+            return 0
+        
+        base_state, entries = base
+        records = _journal_records(base_state, character)
+        if not records:
+            return 0
+        if entries is None or entries + len(records) > self.compact_after:
+            self.compact(character)
+            return 0
+        
+        fsync = FSYNC_SAVES if self.fsync is None else self.fsync
+        journal_path = _journal_path(name, self.save_directory)
+        if not os.path.exists(journal_path):
+            # save_character() replaced the snapshot and dropped the journal
+            self.compact(character)
+            return 0
+        with open(journal_path, 'a') as file:
+            file.write("".join(f"{record}\n" for record in records))
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        
+        self._bases[name] = (_snapshot_for_save(character), entries + len(records))
+        return len(records)
+    
+    def compact(self, character):
+        """Write a full snapshot and start an empty journal on top of it"""
+        fsync = FSYNC_SAVES if self.fsync is None else self.fsync
+        name = character['name']
+        content = format_save_data(character)
+        
+        _save_text_character(character, self.save_directory, fsync)
+        _write_atomic(
+            _journal_path(name, self.save_directory),
+            f"BASE {zlib.crc32(content.encode()):08x}\n",
+            fsync
+        )
+        self._bases[name] = (_snapshot_for_save(character), 0)
+
+def _journal_records(old, new):
+    """
+    Describe the changes between two character states as journal records
+    
+    Returns: List of record strings (without newlines)
+    """
+    records = []
+    if old.get('class') != new['class']:
+        records.append(f"CLASS ={new['class']}")
+    
+    for key in SAVE_OPTIONAL_FIELDS:
+        value = new.get(key.lower())
+        if old.get(key.lower()) != value:
+            records.append(f"{key} ={value or ''}")
+    
+    for key in SAVE_BONUS_FIELDS:
+        value = new.get(key.lower())
+        if old.get(key.lower()) != value:
+            records.append(f"{key} -" if value is None else f"{key} ={_format_bonus(value)}")
+    
+    for key in SAVE_INT_FIELDS:
+        delta = new[key.lower()] - old[key.lower()]
+        if delta:
+            records.append(f"{key} {delta:+d}")
+    
+    for key in SAVE_LIST_FIELDS:
+        old_list = old[key.lower()]
+        new_list = list(new[key.lower()])
+        if old_list == new_list:
+            continue
+        
+        removed = Counter(old_list) - Counter(new_list)
+        added = Counter(new_list) - Counter(old_list)
+        list_records = []
+        replayed = list(old_list)
+        for value, count in removed.items():
+            for _ in range(count):
+                list_records.append(f"{key} -{value}")
+                replayed.remove(value)
+        for value in new_list:
+            if added[value]:
+                added[value] -= 1
+                list_records.append(f"{key} +{value}")
+                replayed.append(value)
+        
+        # Fall back to the whole list when adds/removes wouldn't keep its order
+        if replayed == new_list:
+            records.extend(list_records)
+        else:
+            records.append(f"{key} ={','.join(map(str, new_list))}")
+    
+    return records
+
+def _replay_journal(character, journal_path, snapshot_crc):
+    """
+    Apply journal records on top of a freshly parsed snapshot
+    
+    A journal whose BASE doesn't match the snapshot is stale and ignored,
+    as is a final record cut short by a crash (no trailing newline).
+    
+    Returns: Number of records applied, or None if there is no journal
+             or it is stale
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    if not os.path.exists(journal_path):
+        return None
+    
+    try:
+        with open(journal_path, 'r') as file:
+            lines = file.readlines()
+    except (PermissionError, IOError) as e:
+        raise SaveFileCorruptedError(f"Could not read journal file: {e}")
+    
+    if not lines or lines[0].strip() != f"BASE {snapshot_crc:08x}":
+        return None
+    
+    applied = 0
+    for line in lines[1:]:
+        if not line.endswith("\n"):
+            break
+        
+        try:
+            key, op = line.rstrip("\n").split(" ", 1)
+            field = key.lower()
+            if key in SAVE_INT_FIELDS:
+                character[field] += int(op)
+            elif key in SAVE_LIST_FIELDS and op[0] == "=":
+                character[field] = [v for v in op[1:].split(",") if v]
+            elif key in SAVE_LIST_FIELDS and op[0] == "+":
+                character[field].append(op[1:])
+            elif key in SAVE_LIST_FIELDS and op[0] == "-":
+                character[field].remove(op[1:])
+            elif key in SAVE_OPTIONAL_FIELDS and op[0] == "=":
+                character[field] = op[1:] or None
+            elif key in SAVE_BONUS_FIELDS and op[0] == "=":
+                character[field] = _parse_bonus(op[1:])
+            elif key in SAVE_BONUS_FIELDS and op == "-":
+                character.pop(field, None)
+            elif op[0] == "=":
+                character[field] = op[1:]
+            else:
+                raise ValueError(f"unknown operation {op!r}")
+        except (ValueError, IndexError, KeyError) as e:
+            raise InvalidSaveDataError(f"Journal format error in {line.strip()!r}: {e}")
+        applied += 1
+    
+    return applied
+
+# ============================================================================
+# SAVE FILE HELPERS
+# ============================================================================
+
+def format_save_data(character):
+    """
+    Render a character in the save file text format
+    
+    Returns: String with one KEY: VALUE line per field
+    """
+    inventory_str = ",".join(map(str, character['inventory']))
+    active_str = ",".join(map(str, character['active_quests']))
+    completed_str = ",".join(map(str, character['completed_quests']))
+    
+    optional_str = "".join(
+        f"{key}: {character[key.lower()] or ''}\n"
+        for key in SAVE_OPTIONAL_FIELDS
+        if key.lower() in character
+    )
+    bonus_str = "".join(
+        f"{key}: {_format_bonus(character[key.lower()])}\n"
+        for key in SAVE_BONUS_FIELDS
+        if key.lower() in character
+    )
+    
+    return (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {character['level']}\n"
+        f"HEALTH: {character['health']}\n"
+        f"MAX_HEALTH: {character['max_health']}\n"
+        f"STRENGTH: {character['strength']}\n"
+        f"MAGIC: {character['magic']}\n"
+        f"EXPERIENCE: {character['experience']}\n"
+        f"GOLD: {character['gold']}\n"
+        f"INVENTORY: {inventory_str}\n"
+        f"ACTIVE_QUESTS: {active_str}\n"
+        f"COMPLETED_QUESTS: {completed_str}\n"
+        f"{optional_str}"
+        f"{bonus_str}"
+    )
+
+def encode_save_data(character, save_format=None, compress=None):
+    """
+    Render a character as the contents of a save file
+    
+    Args:
+        character: Character dictionary
+        save_format: "text" or "binary" (None = use SAVE_FORMAT)
+        compress: zlib-compress binary saves (None = use SAVE_COMPRESS)
+    
+    Returns: str for the text format, bytes for the binary format
+    Raises: ValueError for an unknown format
+    """
+    save_format = SAVE_FORMAT if save_format is None else save_format
+    text = format_save_data(character)
+    if save_format == "text":
+        return text
+    if save_format != "binary":
+        raise ValueError(f"Unknown save format: {save_format}")
+    
+    compress = SAVE_COMPRESS if compress is None else compress
+    payload = text.encode("utf-8")
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= SAVE_FLAG_ZLIB
+    header = _SAVE_HEADER.pack(
+        SAVE_MAGIC, SAVE_BINARY_VERSION, flags, len(payload), zlib.crc32(payload)
+    )
+    return header + payload
+
+def decode_save_data(data):
+    """
+    Turn the raw bytes of a save file back into save file text
+    
+    v2 binary saves are recognised by their magic number. A wrong length
+    is caught from the header alone, before the checksum is computed or
+    anything is decompressed or parsed. Anything else is read as v1 text.
+    
+    Returns: Save file text (one KEY: VALUE line per field)
+    Raises: SaveFileCorruptedError if the file is truncated, fails its
+            checksum or can't be decoded
+    """
+    return _decode_save_payload(_save_payload(data))
+
+def read_save_file(filepath, character_name=None):
+    """
+    Load one save file by path, plus the journal next to it
+    
+    For tools that walk a save directory themselves; the game should use
+    load_character(). Either save format is accepted.
+    
+    Args:
+        filepath: Path of a {name}_save.txt file
+        character_name: Name the save belongs to (None = from the file name)
+    
+    Returns: Character dictionary
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    if character_name is None:
+        character_name = os.path.basename(filepath)[:-len("_save.txt")]
+    character, _ = _read_save_file(filepath, character_name)
+    return character
+
+def write_save_file(filepath, character, save_format=None, fsync=None):
+    """
+    Atomically write a character to a save file path
+    
+    Missing directories are created. Unlike save_character(), copies of
+    the save in other layouts and journals are left alone.
+    
+    Args:
+        filepath: Path to write
+        character: Character dictionary
+        save_format: "text" or "binary" (None = use SAVE_FORMAT)
+        fsync: Flush the file and its directory to disk (None = use FSYNC_SAVES)
+    
+    Returns: True if saved successfully
+    Raises: PermissionError, IOError
+    """
+    if fsync is None:
+        fsync = FSYNC_SAVES
+    
+    directory = os.path.dirname(filepath)
+    existing = directory
+    while existing and not os.path.isdir(existing):
+        existing = os.path.dirname(existing)
+    _make_save_directory(directory, existing, fsync)
+    
+    _write_atomic(filepath, encode_save_data(character, save_format), fsync)
+    if fsync:
+        _fsync_directory(directory)
+    return True
+
+def save_path(character_name, save_directory="data/save_games", layout=None):
+    """
+    Return where a character's save file goes in a layout
+    
+    Args:
+        layout: "flat" or "hashed" (None = use SAVE_LAYOUT)
+    
+    Raises: ValueError for an unknown layout
+    """
+    return _save_path(character_name, save_directory, layout)
+
+def find_save_path(character_name, save_directory="data/save_games"):
+    """Return the path of a character's existing save file (either layout), or None"""
+    return _find_save_path(character_name, save_directory)
+
+def journal_path(filepath):
+    """Return the path of the change journal that applies to a save file"""
+    character_name = os.path.basename(filepath)[:-len("_save.txt")]
+    return _journal_path(character_name, None, filepath)
+
+def _format_bonus(effects):
+    """Render equipment stat bonuses as stat:value pairs joined by commas"""
+    return ",".join(f"{stat}:{value}" for stat, value in effects)
+
+def _parse_bonus(value):
+    """
+    Parse "stat:value,stat:value" into a tuple of (stat, value) pairs
+    
+    Raises: ValueError if a pair is malformed
+    """
+    effects = []
+    for part in value.split(","):
+        if not part:
+            continue
+        stat, sep, amount = part.partition(":")
+        if not sep:
+            raise ValueError(f"invalid stat bonus {part!r}")
+        effects.append((sys.intern(stat), int(amount)))
+    return tuple(effects)
+
+def _save_payload(data):
+    """
+    Return the save file text of a save file as bytes
+    
+    v1 files are returned as is; v2 files are checked and decompressed.
+    
+    Raises: SaveFileCorruptedError
+    """
+    if not data.startswith(SAVE_MAGIC):
+        return data
+    
+    if len(data) < _SAVE_HEADER.size:
+        raise SaveFileCorruptedError("Save file header is truncated.")
+    magic, version, flags, length, checksum = _SAVE_HEADER.unpack_from(data)
+    if version != SAVE_BINARY_VERSION:
+        raise SaveFileCorruptedError(f"Unsupported save format version: {version}")
+    
+    payload = data[_SAVE_HEADER.size:]
+    if len(payload) != length:
+        raise SaveFileCorruptedError(
+            f"Save file length mismatch: expected {length} bytes, found {len(payload)}"
+        )
+    if zlib.crc32(payload) != checksum:
+        raise SaveFileCorruptedError("Save file checksum mismatch.")
+    
+    if flags & SAVE_FLAG_ZLIB:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise SaveFileCorruptedError(f"Could not decompress save file: {e}")
+    return payload
+
+def _decode_save_payload(payload):
+    """Decode save file bytes to text, normalising Windows line endings"""
+    try:
+        text = payload.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise SaveFileCorruptedError(f"Could not decode save file: {e}")
+    return text.replace("\r\n", "\n")
+
+def _save_path(character_name, save_directory, layout=None):
+    """
+    Return the path of a character's save file
+    
+    Args:
+        layout: "flat" or "hashed" (None = use SAVE_LAYOUT)
+    """
+    layout = SAVE_LAYOUT if layout is None else layout
+    filename = f"{character_name}_save.txt"
+    if layout == "flat":
+        return os.path.join(save_directory, filename)
+    if layout == "hashed":
+        digest = hashlib.sha1(character_name.encode("utf-8")).hexdigest()
+        return os.path.join(save_directory, digest[:2], digest[2:4], filename)
+    raise ValueError(f"Unknown save layout: {layout}")
+
+def _find_save_path(character_name, save_directory):
+    """
+    Return the path of an existing save file, or None
+    
+    Looks in the SAVE_LAYOUT location first and then the other layout, so
+    saves not yet moved by migrate_save_layout() are still found.
+    """
+    filepath = _save_path(character_name, save_directory)
+    if os.path.exists(filepath):
+        return filepath
+    for layout in SAVE_LAYOUTS:
+        if layout != SAVE_LAYOUT:
+            other = _save_path(character_name, save_directory, layout)
+            if os.path.exists(other):
+                return other
+    return None
+
+def _journal_path(character_name, save_directory, save_path=None):
+    """
+    Return the path of a character's change journal
+    
+    The journal sits next to the save file it applies to: save_path if
+    given, else the existing save (or where a new one would be written).
+    """
+    if save_path is None:
+        save_path = (_find_save_path(character_name, save_directory)
+                     or _save_path(character_name, save_directory))
+    return os.path.join(os.path.dirname(save_path), f"{character_name}_journal.log")
+
+def _make_save_directory(directory, save_directory, fsync):
+    """
+    Create a save (or shard) directory if it doesn't exist yet
+    
+    With fsync, the parents of newly created shard directories are synced
+    so the new entries survive a crash along with the saves inside them.
+    """
+    if os.path.isdir(directory):
+        return
+    os.makedirs(directory, exist_ok=True)
+    if fsync:
+        parent = os.path.dirname(directory)
+        while parent and os.path.normpath(directory) != os.path.normpath(save_directory):
+            _fsync_directory(parent)
+            directory, parent = parent, os.path.dirname(parent)
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _write_atomic(filepath, text, fsync):
+    """
+    Replace filepath with text without ever exposing a partial file
+    
+    Writes to a temporary file in the same directory, optionally fsyncs
+    it, then renames it over filepath. text may be str or bytes.
+    """
+    directory = os.path.dirname(filepath) or "."
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(filepath)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(text, bytes) else 'w') as file:
+            # mkstemp creates owner-only files; keep the target's permissions
+            # (or the umask default for a new file) instead
+            try:
+                mode = os.stat(filepath).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.chmod(temp_path, mode)
+            file.write(text)
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _fsync_directory(directory):
+    """
+    Flush a directory's entries (e.g. renames) to disk
+    
+    Not every platform can open a directory for syncing; there it's skipped.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -0,0 +1,224 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Population Module
+
+Batch versions of the character operations for economy and balance
+simulations. A CharacterPopulation keeps the numeric stats of many
+characters in one NumPy structured array and applies gain_experience,
+add_gold, heal_character and revive_character to all of them at once,
+with the same results as the functions in character_manager.
+
+NumPy is optional: the rest of the game runs without it, and creating a
+CharacterPopulation without it installed raises ImportError.
+"""
+
+import character_manager
+from custom_exceptions import CharacterDeadError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Character fields stored in the structured array, in save file order
+STAT_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+
+# ============================================================================
+# CHARACTER POPULATION
+# ============================================================================
+
+class CharacterPopulation:
+    """
+    Column store of character stats with vectorized operations
+
+    stats is a structured array with one int64 field per STAT_FIELDS
+    entry and one row per character. The remaining character fields
+    (name, class, inventory, quests, equipment) are kept per row in
+    other_fields so to_characters() can rebuild full character dicts.
+    """
+
+    def __init__(self, stats, other_fields=None):
+        """
+        Args:
+            stats: Structured array with stat_dtype() fields
+            other_fields: List of dicts with the non-stat fields of each row
+        """
+        _require_numpy()
+        self.stats = stats
+        self.other_fields = other_fields if other_fields is not None else [{} for _ in range(len(stats))]
+
+    @classmethod
+    def from_characters(cls, characters):
+        """
+        Build a population from character dictionaries
+
+        Args:
+            characters: Iterable of character dicts (or Character records)
+
+        Returns: CharacterPopulation
+        """
+        _require_numpy()
+        characters = list(characters)
+        stats = np.empty(len(characters), dtype=stat_dtype())
+        other_fields = []
+        for row, character in enumerate(characters):
+            stats[row] = tuple(character[field] for field in STAT_FIELDS)
+            other_fields.append({
+                key: list(value) if isinstance(value, list) else value
+                for key, value in character.items()
+                if key not in STAT_FIELDS
+            })
+        return cls(stats, other_fields)
+
+    def to_characters(self):
+        """
+        Rebuild character dictionaries from the population
+
+        Returns: List of character dicts with plain Python ints
+        """
+        columns = {field: self.stats[field].tolist() for field in STAT_FIELDS}
+        characters = []
+        for row, fields in enumerate(self.other_fields):
+            character = {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in fields.items()
+            }
+            for field in STAT_FIELDS:
+                character[field] = columns[field][row]
+            characters.append(character)
+        return characters
+
+    def __len__(self):
+        return len(self.stats)
+
+    def gain_experience(self, xp_amount):
+        """
+        Vectorized character_manager.gain_experience
+
+        Args:
+            xp_amount: XP for every character (scalar or array)
+
+        Returns: Array of levels gained per character
+        Raises: CharacterDeadError if any character has 0 health
+                (nothing is changed in that case)
+        """
+        stats = self.stats
+        if (stats['health'] <= 0).any():
+            raise CharacterDeadError("Character is dead and cannot gain experience.")
+
+        experience = stats['experience'] + np.asarray(xp_amount, dtype=np.int64)
+        levels, xp_spent = levels_for_experience(stats['level'], experience)
+        leveled = levels > 0
+
+        stats['experience'] = experience - xp_spent
+        stats['level'] += levels
+        stats['max_health'] += 10 * levels
+        stats['strength'] += 2 * levels
+        stats['magic'] += 2 * levels
+        stats['health'] = np.where(leveled, stats['max_health'], stats['health'])
+        return levels
+
+    def add_gold(self, amount):
+        """
+        Vectorized character_manager.add_gold
+
+        Args:
+            amount: Gold for every character (scalar or array, may be negative)
+
+        Returns: Array of new gold totals
+        Raises: ValueError if any total would be negative
+                (nothing is changed in that case)
+        """
+        new_total = self.stats['gold'] + np.asarray(amount, dtype=np.int64)
+        if (new_total < 0).any():
+            raise ValueError("Insufficient gold.")
+        self.stats['gold'] = new_total
+        return self.stats['gold'].copy()
+
+    def heal(self, amount):
+        """
+        Vectorized character_manager.heal_character
+
+        Dead characters are not healed; health cannot exceed max_health.
+
+        Args:
+            amount: Healing for every character (scalar or array)
+
+        Returns: Array of amounts actually healed
+        """
+        stats = self.stats
+        missing_health = stats['max_health'] - stats['health']
+        heal_amount = np.minimum(np.asarray(amount, dtype=np.int64), missing_health)
+        heal_amount = np.where(stats['health'] <= 0, 0, heal_amount)
+        stats['health'] += heal_amount
+        return heal_amount
+
+    def revive(self):
+        """
+        Vectorized character_manager.revive_character
+
+        Returns: Boolean array, True where a dead character was revived
+        """
+        stats = self.stats
+        dead = stats['health'] <= 0
+        stats['health'] = np.where(dead, stats['max_health'] // 2, stats['health'])
+        return dead
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def stat_dtype():
+    """Return the structured dtype used for CharacterPopulation.stats"""
+    _require_numpy()
+    return np.dtype([(field, np.int64) for field in STAT_FIELDS])
+
+def levels_for_experience(level, experience):
+    """
+    Vectorized character_manager.levels_for_experience
+
+    Solves the triangular XP curve with a floating point square root and
+    then corrects each row by whole levels, so the result is exact for
+    any value that fits in int64. Rows below level 1 use the scalar
+    function.
+
+    Args:
+        level: Array of current levels
+        experience: Array of available experience
+
+    Returns: Tuple of (levels_gained, xp_spent) arrays
+    """
+    level = np.asarray(level, dtype=np.int64)
+    experience = np.broadcast_to(np.asarray(experience, dtype=np.int64), level.shape)
+    curve_level = np.maximum(level, 1)
+
+    def cost(k):
+        return k * curve_level + k * (k - 1) // 2
+
+    budget = np.maximum(experience // 100, 0)
+    b = 2 * curve_level - 1
+    levels = ((np.sqrt((b * b + 8 * budget).astype(np.float64)) - b) // 2).astype(np.int64)
+    levels = np.maximum(levels, 0)
+
+    too_many = cost(levels) > budget
+    while too_many.any():
+        levels -= too_many
+        too_many = cost(levels) > budget
+    too_few = cost(levels + 1) <= budget
+    while too_few.any():
+        levels += too_few
+        too_few = cost(levels + 1) <= budget
+
+    levels = np.where(experience < curve_level * 100, 0, levels)
+    xp_spent = 100 * cost(levels)
+
+    for row in np.flatnonzero(level < 1):
+        levels[row], xp_spent[row] = character_manager.levels_for_experience(
+            int(level[row]), int(experience[row])
+        )
+    return levels, xp_spent
+
+def _require_numpy():
+    """Raise ImportError if NumPy is not installed"""
+    if np is None:
+        raise ImportError("CharacterPopulation requires NumPy (pip install numpy)")
@@ -0,0 +1,316 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Store Module
+
+This module provides a SQLite storage backend for character saves and
+a helper to migrate saves between backends.
+
+Usage:
+    import character_manager, character_store
+    character_manager.set_storage_backend(character_store.SQLiteBackend())
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import character_manager
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+# Column order shared by the table definition, inserts and selects
+CHARACTER_COLUMNS = (
+    "name", "class", "level", "health", "max_health", "strength", "magic",
+    "experience", "gold", "inventory", "active_quests", "completed_quests",
+    "equipped_weapon", "equipped_armor", "weapon_bonus", "armor_bonus"
+)
+
+LIST_COLUMNS = ("inventory", "active_quests", "completed_quests")
+
+# Nullable columns for the save file's optional fields; NULL means the
+# character doesn't have the field. Equipment is '' when nothing is
+# equipped and bonuses use the save file's stat:value format.
+OPTIONAL_COLUMNS = ("equipped_weapon", "equipped_armor")
+BONUS_COLUMNS = ("weapon_bonus", "armor_bonus")
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+class SQLiteBackend:
+    """
+    Store characters as rows of a SQLite database
+    
+    The database runs in WAL mode so reads don't block behind writes, and
+    characters are keyed (and indexed) by name. List fields are stored as
+    comma-separated text, the same as in the text save format. Databases
+    created before the equipment columns existed get them added on open.
+    
+    Calls can be grouped into a single transaction with
+    `with backend.transaction(): ...`.
+    """
+    
+    def __init__(self, db_path="data/save_games.db"):
+        """
+        Open (and create if needed) a character database
+        
+        Raises: SaveFileCorruptedError if the database can't be opened
+        """
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS characters ("
+                "name TEXT PRIMARY KEY, class TEXT NOT NULL, "
+                "level INTEGER NOT NULL, health INTEGER NOT NULL, "
+                "max_health INTEGER NOT NULL, strength INTEGER NOT NULL, "
+                "magic INTEGER NOT NULL, experience INTEGER NOT NULL, "
+                "gold INTEGER NOT NULL, inventory TEXT NOT NULL, "
+                "active_quests TEXT NOT NULL, completed_quests TEXT NOT NULL, "
+                "equipped_weapon TEXT, equipped_armor TEXT, "
+                "weapon_bonus TEXT, armor_bonus TEXT"
+                ") WITHOUT ROWID"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(characters)")}
+            for column in OPTIONAL_COLUMNS + BONUS_COLUMNS:
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE characters ADD COLUMN {column} TEXT")
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not open character database: {e}")
+    
+    @contextmanager
+    def transaction(self):
+        """Group several saves/deletes into one transaction"""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("COMMIT")
+    
+    def save(self, character):
+        """
+        Insert or replace one character
+        
+        Returns: True if successful
+        Raises: IOError if the database write fails
+        """
+        try:
+            with self.transaction():
+                self._conn.execute(_INSERT_SQL, _character_row(character))
+        except sqlite3.Error as e:
+            raise IOError(f"Could not save character: {e}")
+        return True
+    
+    def save_many(self, characters):
+        """
+        Insert or replace many characters in one transaction
+        
+        Returns: Number of characters saved
+        Raises: IOError if the database write fails
+        """
+        rows = [_character_row(character) for character in characters]
+        try:
+            with self.transaction():
+                self._conn.executemany(_INSERT_SQL, rows)
+        except sqlite3.Error as e:
+            raise IOError(f"Could not save characters: {e}")
+        return len(rows)
+    
+    def load(self, character_name):
+        """
+        Load one character dictionary
+        
+        Raises:
+            CharacterNotFoundError if no character has that name
+            SaveFileCorruptedError if the database can't be read
+            InvalidSaveDataError if the stored row is invalid
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(_SELECT_SQL, (character_name,)).fetchone()
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not read character database: {e}")
+        
+        if row is None:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        
+        character = dict(zip(CHARACTER_COLUMNS, row))
+        for field in LIST_COLUMNS:
+            value = character[field]
+            if not isinstance(value, str):
+                raise InvalidSaveDataError(f"Field {field} must be a list.")
+            character[field] = [v for v in value.split(",") if v]
+        for field in OPTIONAL_COLUMNS:
+            if character[field] is None:
+                del character[field]
+            else:
+                character[field] = character[field] or None
+        for field in BONUS_COLUMNS:
+            if character[field] is None:
+                del character[field]
+                continue
+            try:
+                character[field] = character_manager._parse_bonus(character[field])
+            except (TypeError, ValueError) as e:
+                raise InvalidSaveDataError(f"Field {field} is invalid: {e}")
+        
+        character_manager.validate_character_data(character)
+        return character
+    
+    def list_names(self, limit=None, after=None):
+        """
+        List character names in sorted order, one page at a time
+        
+        Args:
+            limit: Maximum number of names to return (None = all)
+            after: Only return names sorting after this one; pass the last
+                   name of the previous page to get the next page
+        
+        Returns: List of character names
+        """
+        sql = "SELECT name FROM characters"
+        params = []
+        if after is not None:
+            sql += " WHERE name > ?"
+            params.append(after)
+        sql += " ORDER BY name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        try:
+            with self._lock:
+                return [row[0] for row in self._conn.execute(sql, params)]
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not read character database: {e}")
+    
+    def delete(self, character_name):
+        """
+        Delete one character
+        
+        Returns: True if deleted
+        Raises: CharacterNotFoundError if no character has that name
+        """
+        try:
+            with self.transaction():
+                cursor = self._conn.execute(
+                    "DELETE FROM characters WHERE name = ?", (character_name,)
+                )
+        except sqlite3.Error as e:
+            raise IOError(f"Could not delete character: {e}")
+        
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"Character {character_name} not found.")
+        return True
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO characters ({', '.join(CHARACTER_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in CHARACTER_COLUMNS)})"
+)
+
+_SELECT_SQL = f"SELECT {', '.join(CHARACTER_COLUMNS)} FROM characters WHERE name = ?"
+
+def _character_row(character):
+    """Convert a character dictionary to a row tuple in CHARACTER_COLUMNS order"""
+    row = []
+    for field in CHARACTER_COLUMNS:
+        if field in LIST_COLUMNS:
+            row.append(",".join(map(str, character[field])))
+        elif field in OPTIONAL_COLUMNS:
+            row.append((character[field] or "") if field in character else None)
+        elif field in BONUS_COLUMNS:
+            row.append(character_manager._format_bonus(character[field])
+                       if field in character else None)
+        else:
+            row.append(character[field])
+    return tuple(row)
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def migrate_storage(source, destination, batch_size=500):
+    """
+    Copy every character from one backend to another
+    
+    Characters are streamed from the source and written in batches with
+    the destination's save_many(), so only one batch is held in memory.
+    
+    Args:
+        source: Backend to read from (e.g. character_manager.TextFileBackend)
+        destination: Backend to write to (e.g. SQLiteBackend)
+        batch_size: Characters per destination transaction
+    
+    Returns: Dictionary {'migrated': count, 'failed': {name: error_message}}
+    """
+    migrated = 0
+    failed = {}
+    batch = []
+    
+    for name in source.list_names():
+        try:
+            batch.append(source.load(name))
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+            failed[name] = str(e)
+            continue
+        
+        if len(batch) >= batch_size:
+            migrated += destination.save_many(batch)
+            batch = []
+    
+    if batch:
+        migrated += destination.save_many(batch)
+    
+    return {"migrated": migrated, "failed": failed}
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== CHARACTER STORE TEST ===")
+    
+    store = SQLiteBackend(":memory:")
+    try:
+        hero = character_manager.create_character("StoreHero", "Cleric")
+        store.save(hero)
+        print(f"Stored: {store.list_names()}")
+        
+        loaded = store.load("StoreHero")
+        print(f"Loaded: {loaded['name']} - Level {loaded['level']}")
+        
+        store.delete("StoreHero")
+        print("Character deleted successfully")
+    except Exception as e:
+        print(f"Test failed: {e}")
+    finally:
+        store.close()
@@ -11,17 +11,42 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import sys
+import hashlib
+import functools
+import bisect
+import marshal
+import mmap
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Bump whenever the layout of cached catalog records changes
+CATALOG_CACHE_VERSION = 2
+
+# Bump whenever the layout of persisted LazyCatalog indexes changes
+CATALOG_INDEX_VERSION = 1
+
+# Stats an item EFFECT is allowed to modify
+VALID_EFFECT_STATS = ("health", "max_health", "strength", "magic")
+
+# One compiled "stat:value" entry of an item's EFFECT field
+ItemEffect = namedtuple("ItemEffect", ["stat", "value"])
+
+# One problem reported by validate_catalog
+CatalogError = namedtuple("CatalogError", ["line", "message"])
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=False):
     """
     Load quest data from file
     
@@ -34,39 +59,23 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    If use_cache is True, a compiled copy of the catalog is kept next to
+    the file (e.g. quests.txt.cache) and reused while the file is unchanged.
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Quest file not found: {filename}")
-        
-    try:
-        with open(filename, 'r') as f:
-            content = f.read().strip()
-    except (IOError, PermissionError) as e:
-        raise CorruptedDataError(f"Could not read quest file: {e}")
-        
-    if not content:
-        return {}
-        
-    quests = {}
-    blocks = content.split('\n\n')
+    if use_cache:
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"Quest file not found: {filename}")
+        return _load_with_cache(filename, iter_quests, 'quest_id')
     
-    for block in blocks:
-        lines = [line.strip() for line in block.split('\n') if line.strip()]
-        if not lines:
-            continue
-            
-        try:
-            quest_data = parse_quest_block(lines)
-            validate_quest_data(quest_data)
-            quests[quest_data['quest_id']] = quest_data
-        except InvalidDataFormatError as e:
-            raise InvalidDataFormatError(f"Failed to parse quest block: {e}")
-            
+    quests = {}
+    for quest_data in iter_quests(filename):
+        quests[quest_data['quest_id']] = quest_data
     return quests
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False):
     """
     Load item data from file
     
@@ -78,37 +87,105 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
+    EFFECT may list several comma-separated effects (strength:5,magic:2).
+    Each item also gets an 'effects' tuple of ItemEffect compiled at load.
+    
+    If use_cache is True, a compiled copy of the catalog is kept next to
+    the file (e.g. items.txt.cache) and reused while the file is unchanged.
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
+    if use_cache:
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"Item file not found: {filename}")
+        return _load_with_cache(filename, iter_items, 'item_id',
+                                _pack_item_effects, _unpack_item_effects)
+    
+    items = {}
+    for item_data in iter_items(filename):
+        items[item_data['item_id']] = item_data
+    return items
+
+def load_quests_dir(directory="data/quests", workers=None, use_cache=False):
+    """
+    Load and merge every quest shard (*.txt) in a directory
+    
+    Shards are parsed in parallel in a process pool, then merged in
+    sorted filename order so errors are reported the same way every run.
+    
+    Args:
+        directory: Directory containing quest shard files
+        workers: Number of worker processes (None = one per CPU,
+                 1 = parse in this process)
+        use_cache: Passed through to load_quests for each shard
+    
+    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError (including
+            duplicate quest IDs across shards), CorruptedDataError
+    """
+    return _load_catalog_dir(directory, load_quests, "quest", workers, use_cache)
+
+def load_items_dir(directory="data/items", workers=None, use_cache=False):
+    """
+    Load and merge every item shard (*.txt) in a directory
+    
+    Shards are parsed in parallel in a process pool, then merged in
+    sorted filename order so errors are reported the same way every run.
+    
+    Args:
+        directory: Directory containing item shard files
+        workers: Number of worker processes (None = one per CPU,
+                 1 = parse in this process)
+        use_cache: Passed through to load_items for each shard
+    
+    Returns: Dictionary of items {item_id: item_data_dict}
+    Raises: MissingDataFileError, InvalidDataFormatError (including
+            duplicate item IDs across shards), CorruptedDataError
+    """
+    return _load_catalog_dir(directory, load_items, "item", workers, use_cache)
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Stream quests from file one block at a time
+    
+    Reads the file line by line so only the current block is held in
+    memory. Each yielded quest has already been parsed and validated.
+    
+    Yields: Quest dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Quest file not found: {filename}")
+    
+    for line_number, lines in _iter_blocks(filename, "quest"):
+        try:
+            yield build_quest(lines)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(
+                f"Failed to parse quest block at line {line_number}: {e}"
+            )
+
+def iter_items(filename="data/items.txt"):
+    """
+    Stream items from file one block at a time
+    
+    Reads the file line by line so only the current block is held in
+    memory. Each yielded item has already been parsed and validated.
+    
+    Yields: Item dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Item file not found: {filename}")
-        
-    try:
-        with open(filename, 'r') as f:
-            content = f.read().strip()
-    except (IOError, PermissionError) as e:
-        raise CorruptedDataError(f"Could not read item file: {e}")
-        
-    if not content:
-        return {}
-        
-    items = {}
-    blocks = content.split('\n\n')
     
-    for block in blocks:
-        lines = [line.strip() for line in block.split('\n') if line.strip()]
-        if not lines:
-            continue
-            
+    for line_number, lines in _iter_blocks(filename, "item"):
         try:
-            item_data = parse_item_block(lines)
-            validate_item_data(item_data)
-            items[item_data['item_id']] = item_data
+            yield build_item(lines)
         except InvalidDataFormatError as e:
-            raise InvalidDataFormatError(f"Failed to parse item block: {e}")
-            
-    return items
+            raise InvalidDataFormatError(
+                f"Failed to parse item block at line {line_number}: {e}"
+            )
 
 def validate_quest_data(quest_dict):
     """
@@ -163,6 +240,93 @@ def validate_item_data(item_dict):
         
     return True
 
+def validate_catalog(filename, kind=None):
+    """
+    Check a whole quest or item file and report every problem at once
+    
+    Streams the file a single time, checking each block for missing
+    required fields, non-integer numbers, invalid item types and effects,
+    and duplicate IDs, then checks that every quest prerequisite refers
+    to a quest defined somewhere in the file.
+    
+    Args:
+        filename: Path to a quest or item data file
+        kind: "quest" or "item" (None = detect from the first block with
+              an ID line, or failing that from the file name)
+    
+    Returns: List of CatalogError(line, message) sorted by line number;
+             empty if the file is valid
+    Raises: MissingDataFileError, CorruptedDataError, ValueError if the
+            kind can't be determined
+    """
+    if kind not in (None, "quest", "item"):
+        raise ValueError(f"Unknown catalog kind: {kind}")
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Data file not found: {filename}")
+    
+    errors = []
+    seen_ids = {}
+    prerequisites = []
+    # Blocks read before the kind is known (no ID line yet)
+    undetected = []
+    
+    def check_block(start_line, fields):
+        if kind == "quest":
+            _check_quest_fields(fields, start_line, errors, prerequisites)
+            id_field = "quest_id"
+        else:
+            _check_item_fields(fields, start_line, errors)
+            id_field = "item_id"
+        
+        if id_field in fields:
+            record_id, line_number = fields[id_field]
+            if record_id in seen_ids:
+                errors.append(CatalogError(
+                    line_number,
+                    f"Duplicate {kind} ID '{record_id}' (first defined at line {seen_ids[record_id]})"
+                ))
+            else:
+                seen_ids[record_id] = line_number
+    
+    for start_line, lines in _iter_blocks(filename, kind or "data"):
+        fields = {}
+        for offset, line in enumerate(lines):
+            key, sep, value = line.partition(": ")
+            if sep:
+                fields[key.lower()] = (value, start_line + offset)
+        
+        if kind is None:
+            if "quest_id" in fields:
+                kind = "quest"
+            elif "item_id" in fields:
+                kind = "item"
+            else:
+                undetected.append((start_line, fields))
+                continue
+            for block in undetected:
+                check_block(*block)
+            undetected = []
+        
+        check_block(start_line, fields)
+    
+    if undetected:
+        name = os.path.basename(filename).lower()
+        if "quest" in name:
+            kind = "quest"
+        elif "item" in name:
+            kind = "item"
+        else:
+            raise ValueError(f"Can't tell whether {filename} holds quests or items; no block has an ID")
+        for block in undetected:
+            check_block(*block)
+    
+    for line_number, prerequisite in prerequisites:
+        if prerequisite != "NONE" and prerequisite not in seen_ids:
+            errors.append(CatalogError(line_number, f"Unknown prerequisite: {prerequisite}"))
+    
+    errors.sort(key=lambda error: error.line)
+    return errors
+
 def create_default_data_files():
     """
     Create default data files if they don't exist
@@ -209,10 +373,902 @@ def create_default_data_files():
         except IOError:
             print("Failed to create default items.txt")
 
+# ============================================================================
+# LAZY CATALOGS
+# ============================================================================
+
+class LazyCatalog(Mapping):
+    """
+    Read-only quest or item catalog that parses records on demand
+    
+    The data file is memory-mapped and scanned once for QUEST_ID/ITEM_ID
+    lines to build an index of byte offsets, which is persisted next to
+    the file (e.g. quests.txt.idx) and reused while the file's size and
+    mtime are unchanged. A record is only parsed and validated the first
+    time it's looked up, then cached. If a parsed record's ID isn't the
+    one looked up (the file was rewritten at the same size and mtime),
+    the index is rebuilt from the file.
+    
+    Can be passed anywhere a quest_data_dict or item data dictionary is
+    expected. Note that iterating values() or items() parses every record.
+    """
+    
+    def __init__(self, filename, kind):
+        """
+        Open a catalog file
+        
+        Args:
+            filename: Path to quests.txt or items.txt
+            kind: "quest" or "item"
+        
+        Raises: MissingDataFileError, CorruptedDataError, ValueError for
+                an unknown kind
+        """
+        if kind == "quest":
+            self._id_key = b"QUEST_ID"
+            self._build = build_quest
+        elif kind == "item":
+            self._id_key = b"ITEM_ID"
+            self._build = build_item
+        else:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        self._id_field = self._id_key.decode().lower()
+        
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"{kind.capitalize()} file not found: {filename}")
+        
+        self.filename = filename
+        self.kind = kind
+        self._records = {}
+        self._mm = None
+        self._closed = False
+        
+        try:
+            stat = os.stat(filename)
+            if stat.st_size > 0:
+                with open(filename, 'rb') as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, PermissionError) as e:
+            raise CorruptedDataError(f"Could not read {kind} file: {e}")
+        
+        self._index_path = f"{filename}.idx"
+        self._index_key = (CATALOG_INDEX_VERSION, marshal.version, stat.st_size, stat.st_mtime_ns)
+        self._index = _read_catalog_cache(self._index_path, self._index_key)
+        if self._index is None:
+            self._rebuild_index()
+    
+    def __getitem__(self, record_id):
+        """Return the parsed record, parsing it on first access"""
+        record = self._records.get(record_id)
+        if record is not None:
+            return record
+        
+        start, end = self._index[record_id]
+        if self._closed:
+            raise ValueError(
+                f"{self.kind.capitalize()} catalog {self.filename} is closed; "
+                f"'{record_id}' was not loaded before close()"
+            )
+        record = self._parse_block(start, end)
+        if record[self._id_field] != record_id:
+            # Rewritten at the same size and mtime: the persisted index is stale
+            self._rebuild_index()
+            start, end = self._index[record_id]
+            record = self._parse_block(start, end)
+        
+        self._records[record_id] = record
+        return record
+    
+    def __contains__(self, record_id):
+        return record_id in self._index
+    
+    def __iter__(self):
+        return iter(self._index)
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def _parse_block(self, start, end):
+        """Parse the record stored between two byte offsets of the file"""
+        text = self._mm[start:end].decode()
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        try:
+            return self._build(lines)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(
+                f"Failed to parse {self.kind} block at byte {start}: {e}"
+            )
+    
+    def _rebuild_index(self):
+        """Scan the file for record offsets and persist the new index"""
+        self._index = _build_offset_index(self._mm, self._id_key)
+        _write_catalog_cache(self._index_path, self._index_key, self._index)
+    
+    def close(self):
+        """
+        Release the memory map
+        
+        Already-parsed records stay usable; looking up any other record
+        raises ValueError.
+        """
+        self._closed = True
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# COMPACT RECORDS
+# ============================================================================
+
+class _CatalogRecord(Mapping):
+    """
+    Base class for slotted catalog records
+    
+    Records support the same quest['reward_xp'] / item.get('name') access
+    as the plain dictionaries built by parse_quest_block/parse_item_block,
+    but store their fields in __slots__ instead of a per-record dict.
+    """
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __iter__(self):
+        return iter(self.__slots__)
+    
+    def __len__(self):
+        return len(self.__slots__)
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+    
+    def to_dict(self):
+        """Return the record as a plain dictionary"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+class Quest(_CatalogRecord):
+    """Compact quest record; see compact_quests()"""
+    __slots__ = ("quest_id", "title", "description", "reward_xp",
+                 "reward_gold", "required_level", "prerequisite")
+    
+    def __init__(self, quest_id, title, description, reward_xp,
+                 reward_gold, required_level, prerequisite):
+        self.quest_id = sys.intern(quest_id)
+        self.title = title
+        self.description = description
+        self.reward_xp = reward_xp
+        self.reward_gold = reward_gold
+        self.required_level = required_level
+        self.prerequisite = sys.intern(prerequisite)
+
+class Item(_CatalogRecord):
+    """Compact item record; see compact_items()"""
+    __slots__ = ("item_id", "name", "type", "effect", "cost", "description",
+                 "effects")
+    
+    def __init__(self, item_id, name, type, effect, cost, description, effects):
+        self.item_id = sys.intern(item_id)
+        self.name = name
+        self.type = sys.intern(type)
+        self.effect = sys.intern(effect)
+        self.cost = cost
+        self.description = description
+        self.effects = effects
+
+def compact_quests(quests):
+    """
+    Convert a loaded quest catalog to slotted Quest records
+    
+    Quest IDs and prerequisites are interned so repeated references share
+    one string. Fields outside the quest format are dropped.
+    
+    Args:
+        quests: Dictionary from load_quests (or any quest mapping)
+    
+    Returns: Dictionary {quest_id: Quest}
+    """
+    compact = {}
+    for quest in quests.values():
+        record = Quest(*(quest[field] for field in Quest.__slots__))
+        compact[record.quest_id] = record
+    return compact
+
+def compact_items(items):
+    """
+    Convert a loaded item catalog to slotted Item records
+    
+    Item IDs, types and effect strings are interned so repeated values
+    share one string. Fields outside the item format are dropped.
+    
+    Args:
+        items: Dictionary from load_items (or any item mapping)
+    
+    Returns: Dictionary {item_id: Item}
+    """
+    compact = {}
+    for item in items.values():
+        record = Item(*(item[field] for field in Item.__slots__))
+        compact[record.item_id] = record
+    return compact
+
+# ============================================================================
+# SECONDARY INDEXES
+# ============================================================================
+
+class CatalogIndex:
+    """
+    Sorted secondary indexes over loaded quest and item catalogs
+    
+    Quests are indexed by required_level and items by cost (overall and
+    per item type), so range queries run in O(log n + k) with bisect
+    instead of scanning the whole catalog. Ties keep catalog order.
+    
+    The index is a snapshot: rebuild it when the catalogs change.
+    """
+    
+    def __init__(self, quests=None, items=None):
+        """
+        Build indexes for the given catalogs
+        
+        Args:
+            quests: Quest catalog {quest_id: quest} (optional)
+            items: Item catalog {item_id: item} (optional)
+        """
+        self._quests = quests if quests is not None else {}
+        self._items = items if items is not None else {}
+        
+        self._quest_levels, self._quest_ids = _sorted_columns(
+            (quest['required_level'], quest_id) for quest_id, quest in self._quests.items()
+        )
+        
+        rows = [(item['cost'], item_id, item['type']) for item_id, item in self._items.items()]
+        self._item_costs, self._item_ids = _sorted_columns(
+            (cost, item_id) for cost, item_id, item_type in rows
+        )
+        
+        by_type = {}
+        for cost, item_id, item_type in rows:
+            by_type.setdefault(item_type, []).append((cost, item_id))
+        self._items_by_type = {
+            item_type: _sorted_columns(type_rows) for item_type, type_rows in by_type.items()
+        }
+    
+    def quests_in_level_range(self, min_level, max_level):
+        """
+        Get quests whose required_level is between min_level and max_level
+        
+        Returns: List of quest dictionaries ordered by required_level
+        """
+        lo = bisect.bisect_left(self._quest_levels, min_level)
+        hi = bisect.bisect_right(self._quest_levels, max_level)
+        return [self._quests[quest_id] for quest_id in self._quest_ids[lo:hi]]
+    
+    def items_by_cost(self, min_cost=None, max_cost=None, item_type=None):
+        """
+        Get items within a cost range, optionally of one type
+        
+        Args:
+            min_cost: Lowest cost to include (None = no lower bound)
+            max_cost: Highest cost to include (None = no upper bound)
+            item_type: weapon, armor or consumable (None = any type)
+        
+        Returns: List of item dictionaries ordered by cost
+        Example: items_by_cost(max_cost=character['gold'], item_type='weapon')
+        """
+        if item_type is None:
+            costs, item_ids = self._item_costs, self._item_ids
+        else:
+            costs, item_ids = self._items_by_type.get(item_type, ([], []))
+        
+        lo = 0 if min_cost is None else bisect.bisect_left(costs, min_cost)
+        hi = len(costs) if max_cost is None else bisect.bisect_right(costs, max_cost)
+        return [self._items[item_id] for item_id in item_ids[lo:hi]]
+    
+    def items_of_type(self, item_type):
+        """
+        Get all items of one type
+        
+        Returns: List of item dictionaries ordered by cost
+        """
+        return self.items_by_cost(item_type=item_type)
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Keep a quest or item catalog in sync with its data file
+    
+    Changes are detected by polling the file's mtime and size only (no
+    inotify or other OS file notifications), so an edit is picked up
+    within one polling interval. When they change, the file is re-read
+    and only blocks whose text changed are parsed again. The new
+    catalog is built off to the side and published by swapping the
+    `snapshot` attribute, so readers holding the previous dictionary
+    never see a half-loaded catalog. Published snapshots must be treated
+    as read-only.
+    
+    Listeners registered with subscribe() receive a diff dictionary:
+    {'added': [...], 'removed': [...], 'changed': [...]}
+    
+    A watcher given an already-loaded catalog hashes its blocks on the
+    polling thread after start(), so startup doesn't read the file twice.
+    """
+    
+    def __init__(self, filename, kind, records=None):
+        """
+        Start watching a catalog file
+        
+        Args:
+            filename: Path to quests.txt or items.txt
+            kind: "quest" or "item"
+            records: Already-loaded catalog for this file (skips the
+                     initial parse and defers hashing to the watcher
+                     thread), or None to load it now
+        
+        Raises: MissingDataFileError, InvalidDataFormatError,
+                CorruptedDataError, ValueError for an unknown kind
+        """
+        if kind == "quest":
+            self._id_key = "QUEST_ID"
+            self._build = build_quest
+        elif kind == "item":
+            self._id_key = "ITEM_ID"
+            self._build = build_item
+        else:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        
+        self.filename = filename
+        self.kind = kind
+        self.snapshot = {}
+        self.last_error = None
+        self._block_hashes = {}
+        self._file_state = None
+        self._unseeded = False
+        self._listeners = []
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+        if records is None:
+            self.reload()
+        else:
+            self.snapshot = records
+            self._file_state = self._read_file_state()
+            self._unseeded = True
+    
+    def subscribe(self, callback):
+        """Call callback(diff) after every reload that changed something"""
+        self._listeners.append(callback)
+    
+    def poll(self):
+        """
+        Reload the catalog if the file changed since the last load
+        
+        Returns: Diff dictionary, or None if the file is unchanged
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if self._read_file_state() == self._file_state:
+            return None
+        return self.reload()
+    
+    def reload(self):
+        """
+        Re-read the file, re-parsing only blocks that changed
+        
+        Returns: Diff dictionary
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+                (the published snapshot is left untouched on error)
+        """
+        with self._reload_lock:
+            file_state = self._read_file_state()
+            old_snapshot = self.snapshot
+            new_snapshot = {}
+            new_hashes = {}
+            
+            for line_number, lines in _iter_blocks(self.filename, self.kind):
+                record_id = _block_record_id(lines, self._id_key)
+                block_hash = _block_hash(lines)
+                
+                if record_id is not None and self._block_hashes.get(record_id) == block_hash:
+                    record = old_snapshot[record_id]
+                else:
+                    try:
+                        record = self._build(lines)
+                    except InvalidDataFormatError as e:
+                        raise InvalidDataFormatError(
+                            f"Failed to parse {self.kind} block at line {line_number}: {e}"
+                        )
+                    record_id = record[self._id_key.lower()]
+                
+                new_snapshot[record_id] = record
+                new_hashes[record_id] = block_hash
+            
+            diff = {
+                "added": sorted(new_snapshot.keys() - old_snapshot.keys()),
+                "removed": sorted(old_snapshot.keys() - new_snapshot.keys()),
+                "changed": sorted(
+                    record_id for record_id in new_snapshot.keys() & old_snapshot.keys()
+                    if new_snapshot[record_id] is not old_snapshot[record_id]
+                ),
+            }
+            
+            self._block_hashes = new_hashes
+            self._file_state = file_state
+            self.snapshot = new_snapshot
+            self.last_error = None
+            self._unseeded = False
+        
+        if diff["added"] or diff["removed"] or diff["changed"]:
+            for callback in self._listeners:
+                callback(diff)
+        return diff
+    
+    def start(self, interval=1.0):
+        """Poll for changes every `interval` seconds on a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name=f"{self.kind}-catalog-watcher",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the polling thread, if running"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+    
+    def _run(self, interval):
+        """Polling loop; a bad edit keeps the old snapshot and sets last_error"""
+        try:
+            self._seed()
+        except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
+            self.last_error = e
+        while not self._stop_event.wait(interval):
+            try:
+                self.poll()
+            except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
+                self.last_error = e
+    
+    def _seed(self):
+        """
+        Hash the blocks of an adopted catalog without parsing them
+        
+        If the file changed since the catalog was adopted, its blocks may
+        not match the records, so no hashes are kept and the next reload
+        parses every block.
+        """
+        with self._reload_lock:
+            if not self._unseeded:
+                return
+            self._unseeded = False
+            
+            hashes = {}
+            for line_number, lines in _iter_blocks(self.filename, self.kind):
+                record_id = _block_record_id(lines, self._id_key)
+                if record_id in self.snapshot:
+                    hashes[record_id] = _block_hash(lines)
+            if self._read_file_state() == self._file_state:
+                self._block_hashes = hashes
+    
+    def _read_file_state(self):
+        """Return (mtime, size) of the watched file"""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            raise MissingDataFileError(
+                f"{self.kind.capitalize()} file not found: {self.filename}"
+            )
+        except OSError as e:
+            raise CorruptedDataError(f"Could not read {self.kind} file: {e}")
+        return stat.st_mtime_ns, stat.st_size
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _iter_blocks(filename, kind):
+    """
+    Read a data file line by line and group it into blank-line separated blocks
+    
+    Args:
+        filename: Path to the data file
+        kind: "quest" or "item", used in error messages
+    
+    Yields: Tuples of (starting_line_number, list_of_stripped_lines)
+    Raises: CorruptedDataError if the file can't be read
+    """
+    block = []
+    start_line = 0
+    try:
+        with open(filename, 'r') as f:
+            for line_number, raw_line in enumerate(f, 1):
+                line = raw_line.strip()
+                if line:
+                    if not block:
+                        start_line = line_number
+                    block.append(line)
+                elif block:
+                    yield start_line, block
+                    block = []
+    except (IOError, PermissionError) as e:
+        raise CorruptedDataError(f"Could not read {kind} file: {e}")
+    
+    if block:
+        yield start_line, block
+
+def _load_catalog_dir(directory, load_shard, kind, workers, use_cache):
+    """
+    Load every *.txt shard in a directory and merge the results
+    
+    Args:
+        directory: Directory containing shard files
+        load_shard: load_quests or load_items
+        kind: "quest" or "item", used in error messages
+        workers: Process pool size (1 = no pool)
+        use_cache: Passed through to load_shard
+    
+    Returns: Merged dictionary of records
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.isdir(directory):
+        raise MissingDataFileError(f"{kind.capitalize()} directory not found: {directory}")
+    
+    shards = sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".txt")
+    )
+    load = functools.partial(load_shard, use_cache=use_cache)
+    
+    if workers == 1 or len(shards) <= 1:
+        results = [_run_shard(load, shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_shard, load, shard) for shard in shards]
+            results = [future.result() for future in futures]
+    
+    merged = {}
+    owners = {}
+    for shard, (records, error) in zip(shards, results):
+        if error is not None:
+            raise type(error)(f"Shard {shard}: {error}")
+        
+        for record_id, record in records.items():
+            if record_id in owners:
+                raise InvalidDataFormatError(
+                    f"Shard {shard}: duplicate {kind} ID '{record_id}' "
+                    f"(already defined in {owners[record_id]})"
+                )
+            owners[record_id] = shard
+            merged[record_id] = record
+    
+    return merged
+
+def _run_shard(load, shard):
+    """
+    Load one shard, returning the error instead of raising it
+    
+    This lets the merge report the first failing shard in filename order
+    regardless of which worker finished first.
+    
+    Returns: Tuple of (records, error)
+    """
+    try:
+        return load(shard), None
+    except (InvalidDataFormatError, MissingDataFileError, CorruptedDataError) as e:
+        return {}, e
+
+def _sorted_columns(rows):
+    """
+    Sort (key, record_id) rows by key, keeping input order for ties
+    
+    Returns: Tuple of (list_of_keys, list_of_record_ids) for bisect lookups
+    """
+    rows = sorted(rows, key=lambda row: row[0])
+    return [row[0] for row in rows], [row[1] for row in rows]
+
+def _block_record_id(lines, id_key):
+    """
+    Find a block's QUEST_ID/ITEM_ID without parsing the rest of it
+    
+    Returns: The record ID, or None if the block has no ID line
+    """
+    record_id = None
+    for line in lines:
+        key, sep, value = line.partition(": ")
+        if sep and key.upper() == id_key:
+            record_id = value
+    return record_id
+
+def _block_hash(lines):
+    """Return a short digest of a block's text for change detection"""
+    return hashlib.blake2b("\n".join(lines).encode(), digest_size=16).digest()
+
+def _check_quest_fields(fields, start_line, errors, prerequisites):
+    """
+    Append a CatalogError for every problem in one parsed quest block
+    
+    Args:
+        fields: Dictionary {lowercase_key: (value, line_number)}
+        start_line: Line number of the block's first line
+        errors: List to append CatalogError entries to
+        prerequisites: List to append (line_number, prerequisite) to
+    """
+    for field in ("quest_id", "title", "description", "reward_xp",
+                  "reward_gold", "required_level", "prerequisite"):
+        if field not in fields:
+            errors.append(CatalogError(start_line, f"Missing required field: {field}"))
+    
+    for field in ("reward_xp", "reward_gold", "required_level"):
+        if field in fields:
+            value, line_number = fields[field]
+            try:
+                int(value)
+            except ValueError:
+                errors.append(CatalogError(line_number, f"{field} must be an integer: {value}"))
+    
+    if "prerequisite" in fields:
+        value, line_number = fields["prerequisite"]
+        prerequisites.append((line_number, value))
+
+def _check_item_fields(fields, start_line, errors):
+    """
+    Append a CatalogError for every problem in one parsed item block
+    
+    Args:
+        fields: Dictionary {lowercase_key: (value, line_number)}
+        start_line: Line number of the block's first line
+        errors: List to append CatalogError entries to
+    """
+    for field in ("item_id", "name", "type", "effect", "cost", "description"):
+        if field not in fields:
+            errors.append(CatalogError(start_line, f"Missing required field: {field}"))
+    
+    if "type" in fields:
+        value, line_number = fields["type"]
+        if value not in ("weapon", "armor", "consumable"):
+            errors.append(CatalogError(line_number, f"Invalid item type: {value}"))
+    
+    if "cost" in fields:
+        value, line_number = fields["cost"]
+        try:
+            int(value)
+        except ValueError:
+            errors.append(CatalogError(line_number, f"cost must be an integer: {value}"))
+    
+    if "effect" in fields:
+        value, line_number = fields["effect"]
+        try:
+            compile_item_effect(value)
+        except InvalidDataFormatError as e:
+            errors.append(CatalogError(line_number, str(e)))
+
+def _catalog_fingerprint(filename):
+    """
+    Build the cache key for a data file from its size, mtime and content hash
+    
+    Returns: Tuple identifying the exact file contents and cache layout
+    Raises: CorruptedDataError if the file can't be read
+    """
+    digest = hashlib.sha256()
+    try:
+        stat = os.stat(filename)
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except (IOError, PermissionError) as e:
+        raise CorruptedDataError(f"Could not read data file: {e}")
+    
+    return (CATALOG_CACHE_VERSION, marshal.version, stat.st_size,
+            stat.st_mtime_ns, digest.hexdigest())
+
+def _read_catalog_cache(cache_path, key):
+    """
+    Read a compiled catalog if its key matches
+    
+    Returns: Dictionary of records, or None if the cache is missing,
+             stale or corrupt
+    """
+    try:
+        # marshal.load() on a file object is several times slower than
+        # reading the whole file and decoding it from memory
+        with open(cache_path, 'rb') as f:
+            cached = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    
+    if not isinstance(cached, tuple) or len(cached) != 2:
+        return None
+    cached_key, records = cached
+    if cached_key != key or not isinstance(records, dict):
+        return None
+    return records
+
+def _write_catalog_cache(cache_path, key, records):
+    """
+    Write a compiled catalog next to its source file
+    
+    The cache is only an optimization, so failures (e.g. a read-only data
+    directory) are ignored.
+    """
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(marshal.dumps((key, records)))
+        os.replace(temp_path, cache_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+def _load_with_cache(filename, iter_records, id_field, pack=None, unpack=None):
+    """
+    Load a catalog from its compiled cache, rebuilding the cache if needed
+    
+    Args:
+        filename: Path to the text data file
+        iter_records: iter_quests or iter_items
+        id_field: 'quest_id' or 'item_id'
+        pack: Optional function converting a record to marshal-able types
+        unpack: Optional function reversing pack on a cached record
+    
+    Returns: Dictionary of records keyed by id_field
+    """
+    cache_path = f"{filename}.cache"
+    key = _catalog_fingerprint(filename)
+    
+    records = _read_catalog_cache(cache_path, key)
+    if records is not None:
+        if unpack is not None:
+            for record in records.values():
+                unpack(record)
+        return records
+    
+    records = {}
+    for record in iter_records(filename):
+        records[record[id_field]] = record
+    
+    if pack is None:
+        _write_catalog_cache(cache_path, key, records)
+    else:
+        packed = {record_id: pack(record) for record_id, record in records.items()}
+        _write_catalog_cache(cache_path, key, packed)
+    return records
+
+def _pack_item_effects(item):
+    """Return a copy of item with its ItemEffect tuples stored as plain tuples"""
+    packed = dict(item)
+    packed['effects'] = tuple(tuple(effect) for effect in item['effects'])
+    return packed
+
+def _unpack_item_effects(item):
+    """Turn cached plain effect tuples back into ItemEffect in place"""
+    item['effects'] = tuple(ItemEffect(*effect) for effect in item['effects'])
+
+def _build_offset_index(mm, id_key):
+    """
+    Scan a memory-mapped data file for record IDs without parsing records
+    
+    Args:
+        mm: mmap of the data file (None for an empty file)
+        id_key: b"QUEST_ID" or b"ITEM_ID"
+    
+    Returns: Dictionary {record_id: (start_offset, end_offset)}
+    """
+    index = {}
+    if mm is None:
+        return index
+    
+    size = len(mm)
+    pos = 0
+    block_start = None
+    block_end = 0
+    block_id = None
+    
+    while pos <= size:
+        end = mm.find(b"\n", pos)
+        if end == -1:
+            end = size
+        line = mm[pos:end].strip()
+        
+        if line:
+            if block_start is None:
+                block_start = pos
+                block_id = None
+            key, sep, value = line.partition(b": ")
+            if sep and key.upper() == id_key:
+                block_id = value.decode()
+            block_end = end
+        elif block_start is not None:
+            if block_id is not None:
+                index[block_id] = (block_start, block_end)
+            block_start = None
+        
+        pos = end + 1
+    
+    if block_start is not None and block_id is not None:
+        index[block_id] = (block_start, block_end)
+    
+    return index
+
+def build_quest(lines):
+    """
+    Parse and validate one quest block
+    
+    Returns: Quest dictionary
+    Raises: InvalidDataFormatError if the block is malformed
+    """
+    quest_data = parse_quest_block(lines)
+    validate_quest_data(quest_data)
+    return quest_data
+
+def build_item(lines):
+    """
+    Parse, validate and compile the effects of one item block
+    
+    Returns: Item dictionary, including a compiled 'effects' tuple
+    Raises: InvalidDataFormatError if the block is malformed
+    """
+    item_data = parse_item_block(lines)
+    validate_item_data(item_data)
+    item_data['effects'] = compile_item_effect(item_data['effect'])
+    return item_data
+
+def compile_item_effect(effect_string):
+    """
+    Compile an item EFFECT string into typed effects
+    
+    Args:
+        effect_string: One or more comma-separated "stat_name:value" pairs
+    
+    Returns: Tuple of ItemEffect
+    Example: "strength:5,magic:2" → (ItemEffect('strength', 5), ItemEffect('magic', 2))
+    Raises: InvalidDataFormatError if a stat is unknown or a value isn't an integer
+    """
+    effects = []
+    for part in effect_string.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        
+        stat_name, sep, value = part.partition(":")
+        stat_name = stat_name.strip()
+        if not sep:
+            raise InvalidDataFormatError(f"Invalid item effect: {part}")
+        if stat_name not in VALID_EFFECT_STATS:
+            raise InvalidDataFormatError(f"Unknown effect stat: {stat_name}")
+        try:
+            value = int(value)
+        except ValueError:
+            raise InvalidDataFormatError(f"Invalid effect value: {part}")
+        
+        effects.append(ItemEffect(sys.intern(stat_name), value))
+    
+    if not effects:
+        raise InvalidDataFormatError("Item effect is empty")
+    return tuple(effects)
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -10,6 +10,8 @@ and make save-file parsing more robust.
 This module handles inventory management, item usage, and equipment.
 """
 
+import game_data
+import character_manager
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -38,7 +40,7 @@ def add_item_to_inventory(character, item_id):
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full.")
     
-    character['inventory'].append(item_id)
+    character_manager.unshare_list(character, 'inventory').append(item_id)
     return True
 
 def remove_item_from_inventory(character, item_id):
@@ -55,7 +57,7 @@ def remove_item_from_inventory(character, item_id):
     if item_id not in character['inventory']:
         raise ItemNotFoundError(f"Item {item_id} not found in inventory.")
     
-    character['inventory'].remove(item_id)
+    character_manager.unshare_list(character, 'inventory').remove(item_id)
     return True
 
 def has_item(character, item_id):
@@ -121,10 +123,10 @@ def use_item(character, item_id, item_data):
         item_name = item_data.get('name', item_id)
         raise InvalidItemTypeError(f"Item {item_name} is not consumable.")
     
-    stat_name, value = parse_item_effect(item_data['effect'])
-    apply_stat_effect(character, stat_name, value)
+    for effect in get_item_effects(item_data):
+        apply_stat_effect(character, effect.stat, effect.value)
     
-    character['inventory'].remove(item_id)
+    character_manager.unshare_list(character, 'inventory').remove(item_id)
     item_name = item_data.get('name', item_id)
     return f"Used {item_name}."
 
@@ -158,12 +160,13 @@ def equip_weapon(character, item_id, item_data):
     if 'equipped_weapon' in character and character['equipped_weapon']:
         unequip_weapon(character)
         
-    stat_name, value = parse_item_effect(item_data['effect'])
-    apply_stat_effect(character, stat_name, value)
+    effects = get_item_effects(item_data)
+    for effect in effects:
+        apply_stat_effect(character, effect.stat, effect.value)
     
-    character['inventory'].remove(item_id)
+    character_manager.unshare_list(character, 'inventory').remove(item_id)
     character['equipped_weapon'] = item_id
-    character['weapon_bonus'] = (stat_name, value)
+    character['weapon_bonus'] = effects
     
     item_name = item_data.get('name', item_id)
     return f"Equipped {item_name}."
@@ -198,12 +201,13 @@ def equip_armor(character, item_id, item_data):
     if 'equipped_armor' in character and character['equipped_armor']:
         unequip_armor(character)
         
-    stat_name, value = parse_item_effect(item_data['effect'])
-    apply_stat_effect(character, stat_name, value)
+    effects = get_item_effects(item_data)
+    for effect in effects:
+        apply_stat_effect(character, effect.stat, effect.value)
     
-    character['inventory'].remove(item_id)
+    character_manager.unshare_list(character, 'inventory').remove(item_id)
     character['equipped_armor'] = item_id
-    character['armor_bonus'] = (stat_name, value)
+    character['armor_bonus'] = effects
     
     item_name = item_data.get('name', item_id)
     return f"Equipped {item_name}."
@@ -224,11 +228,11 @@ def unequip_weapon(character):
     item_id = character['equipped_weapon']
     
     if 'weapon_bonus' in character:
-        stat_name, value = character['weapon_bonus']
-        apply_stat_effect(character, stat_name, -value)
+        for stat_name, value in character['weapon_bonus']:
+            apply_stat_effect(character, stat_name, -value)
         del character['weapon_bonus']
         
-    character['inventory'].append(item_id)
+    character_manager.unshare_list(character, 'inventory').append(item_id)
     character['equipped_weapon'] = None
     
     return item_id
@@ -249,11 +253,11 @@ def unequip_armor(character):
     item_id = character['equipped_armor']
     
     if 'armor_bonus' in character:
-        stat_name, value = character['armor_bonus']
-        apply_stat_effect(character, stat_name, -value)
+        for stat_name, value in character['armor_bonus']:
+            apply_stat_effect(character, stat_name, -value)
         del character['armor_bonus']
         
-    character['inventory'].append(item_id)
+    character_manager.unshare_list(character, 'inventory').append(item_id)
     character['equipped_armor'] = None
     
     return item_id
@@ -283,7 +287,7 @@ def purchase_item(character, item_id, item_data):
         raise InventoryFullError("Inventory is full.")
         
     character['gold'] -= item_data['cost']
-    character['inventory'].append(item_id)
+    character_manager.unshare_list(character, 'inventory').append(item_id)
     return True
 
 def sell_item(character, item_id, item_data):
@@ -302,7 +306,7 @@ def sell_item(character, item_id, item_data):
         raise ItemNotFoundError(f"Item {item_id} not found in inventory.")
         
     sell_value = item_data['cost'] // 2
-    character['inventory'].remove(item_id)
+    character_manager.unshare_list(character, 'inventory').remove(item_id)
     character['gold'] += sell_value
     return sell_value
 
@@ -310,6 +314,22 @@ def sell_item(character, item_id, item_data):
 # HELPER FUNCTIONS
 # ============================================================================
 
+def get_item_effects(item_data):
+    """
+    Get the compiled effects of an item
+    
+    Items loaded through game_data carry an 'effects' tuple compiled at
+    load time; hand-built item dictionaries with only an 'effect' string
+    are compiled on the fly.
+    
+    Returns: Tuple of game_data.ItemEffect
+    Raises: InvalidDataFormatError if the effect string is malformed
+    """
+    effects = item_data.get('effects')
+    if effects is None:
+        effects = game_data.compile_item_effect(item_data['effect'])
+    return effects
+
 def parse_item_effect(effect_string):
     """
     Parse item effect string into stat name and value
@@ -21,8 +21,16 @@ from custom_exceptions import *
 current_character = None
 all_quests = {}
 all_items = {}
+catalog_index = game_data.CatalogIndex()
 game_running = False
 
+# Writes saves on a background thread so slow disks don't stall the game
+save_writer = None
+
+# Watchers that hot-reload all_quests/all_items when the data files change
+quest_watcher = None
+item_watcher = None
+
 def main_menu():
     print("\n=== MAIN MENU ===")
     print("1. New Game")
@@ -50,7 +58,7 @@ def new_game():
     try:
         current_character = character_manager.create_character(name, char_class)
         print(f"Character {name} created successfully!")
-        character_manager.save_character(current_character)
+        persist_character()
         game_loop()
     except InvalidCharacterClassError as e:
         print(f"Error creating character: {e}")
@@ -59,6 +67,7 @@ def load_game():
     global current_character
     
     print("\n=== LOAD GAME ===")
+    flush_saves()
     saved_chars = character_manager.list_saved_characters()
     
     if not saved_chars:
@@ -84,6 +93,8 @@ def game_loop():
     game_running = True
     
     while game_running:
+        refresh_game_data()
+        
         if current_character['health'] <= 0:
             handle_character_death()
             if not game_running:
@@ -291,8 +302,8 @@ def shop():
     print("\n=== ITEM SHOP ===")
     print(f"Your Gold: {current_character['gold']}")
     print("Available Items:")
-    for item_id, item in all_items.items():
-        print(f"- {item['name']} ({item['type']}): {item['cost']} Gold (ID: {item_id})")
+    for item in catalog_index.items_by_cost():
+        print(f"- {item['name']} ({item['type']}): {item['cost']} Gold (ID: {item['item_id']})")
         
     print("\n1. Buy Item")
     print("2. Sell Item")
@@ -325,14 +336,53 @@ def shop():
 def save_game():
     global current_character
     try:
+        persist_character()
+    except Exception as e:
+        print(f"Error saving game: {e}")
+
+def persist_character():
+    if save_writer is not None:
+        save_writer.save(current_character)
+    else:
         character_manager.save_character(current_character)
+
+def flush_saves():
+    if save_writer is None:
+        return
+    try:
+        save_writer.flush()
     except Exception as e:
         print(f"Error saving game: {e}")
 
 def load_game_data():
-    global all_quests, all_items
-    all_quests = game_data.load_quests()
-    all_items = game_data.load_items()
+    global all_quests, all_items, catalog_index, quest_watcher, item_watcher
+    all_quests = game_data.load_quests(use_cache=True)
+    all_items = game_data.load_items(use_cache=True)
+    catalog_index = game_data.CatalogIndex(all_quests, all_items)
+    
+    stop_data_watchers()
+    quest_watcher = game_data.CatalogWatcher("data/quests.txt", "quest", all_quests)
+    item_watcher = game_data.CatalogWatcher("data/items.txt", "item", all_items)
+    quest_watcher.start()
+    item_watcher.start()
+
+def refresh_game_data():
+    global all_quests, all_items, catalog_index
+    quests = quest_watcher.snapshot if quest_watcher is not None else all_quests
+    items = item_watcher.snapshot if item_watcher is not None else all_items
+    
+    if quests is not all_quests or items is not all_items:
+        all_quests = quests
+        all_items = items
+        catalog_index = game_data.CatalogIndex(all_quests, all_items)
+
+def stop_data_watchers():
+    global quest_watcher, item_watcher
+    for watcher in (quest_watcher, item_watcher):
+        if watcher is not None:
+            watcher.stop()
+    quest_watcher = None
+    item_watcher = None
 
 def handle_character_death():
     global current_character, game_running
@@ -358,6 +408,7 @@ def display_welcome():
     print()
 
 def main():
+    global save_writer
     display_welcome()
     
     try:
@@ -375,6 +426,8 @@ def main():
         print(f"Error loading game data: {e}")
         return
     
+    save_writer = character_manager.AsyncSaveWriter()
+    
     while True:
         choice = main_menu()
         
@@ -385,6 +438,11 @@ def main():
         elif choice == 3:
             print("\nThanks for playing Quest Chronicles!")
             break
+    
+    stop_data_watchers()
+    flush_saves()
+    save_writer.close()
+    save_writer = None
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -11,6 +11,7 @@ This module handles quest management, dependencies, and completion.
 """
 
 import character_manager
+import game_data
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
@@ -19,6 +20,11 @@ from custom_exceptions import (
     InsufficientLevelError
 )
 
+# (catalog, quest count, CatalogIndex) last built by get_quests_by_level.
+# Catalogs are replaced rather than edited (CatalogWatcher publishes new
+# snapshots), so a different dictionary or size means a new index.
+_level_index = (None, 0, None)
+
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
@@ -62,7 +68,7 @@ def accept_quest(character, quest_id, quest_data_dict):
     if quest_id in character['active_quests']:
         return False
 
-    character['active_quests'].append(quest_id)
+    character_manager.unshare_list(character, 'active_quests').append(quest_id)
     return True
 
 def complete_quest(character, quest_id, quest_data_dict):
@@ -91,8 +97,8 @@ def complete_quest(character, quest_id, quest_data_dict):
 
     quest = quest_data_dict[quest_id]
     
-    character['active_quests'].remove(quest_id)
-    character['completed_quests'].append(quest_id)
+    character_manager.unshare_list(character, 'active_quests').remove(quest_id)
+    character_manager.unshare_list(character, 'completed_quests').append(quest_id)
 
     character_manager.gain_experience(character, quest['reward_xp'])
     character_manager.add_gold(character, quest['reward_gold'])
@@ -112,7 +118,7 @@ def abandon_quest(character, quest_id):
     if quest_id not in character['active_quests']:
         raise QuestNotActiveError(f"Quest {quest_id} is not active.")
 
-    character['active_quests'].remove(quest_id)
+    character_manager.unshare_list(character, 'active_quests').remove(quest_id)
     return True
 
 def get_active_quests(character, quest_data_dict):
@@ -264,17 +270,35 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
             
     return {"total_xp": total_xp, "total_gold": total_gold}
 
-def get_quests_by_level(quest_data_dict, min_level, max_level):
+def get_quests_by_level(quest_data_dict, min_level, max_level, catalog_index=None):
     """
     Get all quests within a level range
     
-    Returns: List of quest dictionaries
-    """
-    result = []
-    for quest in quest_data_dict.values():
-        if min_level <= quest['required_level'] <= max_level:
-            result.append(quest)
-    return result
+    Looks the range up in a game_data.CatalogIndex in O(log n + k). The
+    index is built on the first call for a catalog and reused while the
+    same dictionary (with the same number of quests) is passed; pass a
+    fresh catalog_index after editing quests in place.
+    
+    Args:
+        quest_data_dict: Dictionary of all quest data
+        min_level, max_level: Inclusive required_level range
+        catalog_index: game_data.CatalogIndex built over quest_data_dict
+                       (None = use the cached index for quest_data_dict)
+    
+    Returns: List of quest dictionaries ordered by required_level
+    """
+    if catalog_index is None:
+        catalog_index = _quest_level_index(quest_data_dict)
+    return catalog_index.quests_in_level_range(min_level, max_level)
+
+def _quest_level_index(quest_data_dict):
+    """Return a CatalogIndex over quest_data_dict, reusing the last one built"""
+    global _level_index
+    catalog, count, index = _level_index
+    if catalog is not quest_data_dict or count != len(quest_data_dict):
+        index = game_data.CatalogIndex(quest_data_dict)
+        _level_index = (quest_data_dict, len(quest_data_dict), index)
+    return index
 
 # ============================================================================
 # DISPLAY FUNCTIONS
@@ -37,6 +37,22 @@ def test_character_dead_exception():
     with pytest.raises(CharacterDeadError):
         character_manager.gain_experience(char, 50)
 
+def test_corrupted_binary_save_exception(tmp_path, monkeypatch):
+    """Test that SaveFileCorruptedError is raised for damaged binary saves"""
+    monkeypatch.setattr(character_manager, "SAVE_FORMAT", "binary")
+    char = character_manager.create_character("Corrupt", "Rogue")
+    character_manager.save_character(char, str(tmp_path), fsync=False)
+    save_file = tmp_path / "Corrupt_save.txt"
+    data = save_file.read_bytes()
+    
+    save_file.write_bytes(data[:-1] + bytes([data[-1] ^ 0xFF]))
+    with pytest.raises(SaveFileCorruptedError, match="checksum"):
+        character_manager.load_character("Corrupt", str(tmp_path))
+    
+    save_file.write_bytes(data[:-5])
+    with pytest.raises(SaveFileCorruptedError, match="length"):
+        character_manager.load_character("Corrupt", str(tmp_path))
+
 # ============================================================================
 # INVENTORY EXCEPTION TESTS
 # ============================================================================
@@ -160,6 +176,70 @@ def test_invalid_data_format_exception():
     finally:
         os.remove("test_bad_data.txt")
 
+def test_invalid_data_format_reports_line_number(tmp_path):
+    """Test that streaming parse errors point at the offending block"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(
+        "QUEST_ID: ok\nTITLE: Ok\nDESCRIPTION: Fine\nREWARD_XP: 10\n"
+        "REWARD_GOLD: 5\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n\n"
+        "QUEST_ID: bad\nREWARD_XP: lots\n"
+    )
+    
+    quests = game_data.iter_quests(str(quest_file))
+    assert next(quests)['quest_id'] == 'ok'
+    
+    with pytest.raises(InvalidDataFormatError, match="line 10"):
+        next(quests)
+
+def test_invalid_item_effect_rejected_at_load(tmp_path):
+    """Test that malformed item effects fail when the catalog loads"""
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(
+        "ITEM_ID: cursed\nNAME: Cursed\nTYPE: weapon\n"
+        "EFFECT: luck:5\nCOST: 10\nDESCRIPTION: Unknown stat\n"
+    )
+    
+    with pytest.raises(InvalidDataFormatError, match="Unknown effect stat"):
+        game_data.load_items(str(item_file))
+
+def test_validate_catalog_reports_all_errors(tmp_path):
+    """Test that bulk validation collects every error instead of stopping"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(
+        "QUEST_ID: a\nTITLE: A\nREWARD_XP: lots\nREWARD_GOLD: 1\n"
+        "REQUIRED_LEVEL: 1\nPREREQUISITE: missing_quest\n\n"
+        "QUEST_ID: a\nTITLE: B\nDESCRIPTION: d\nREWARD_XP: 1\n"
+        "REWARD_GOLD: some\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n"
+    )
+    
+    errors = game_data.validate_catalog(str(quest_file))
+    assert [error.line for error in errors] == [1, 3, 6, 8, 12]
+    assert "description" in errors[0].message
+    assert "missing_quest" in errors[2].message
+    assert "Duplicate" in errors[3].message
+    
+    assert game_data.validate_catalog("data/quests.txt") == []
+    assert game_data.validate_catalog("data/items.txt") == []
+
+def test_validate_catalog_reports_first_block_without_id(tmp_path):
+    """Test that an ID-less first block is reported instead of stopping detection"""
+    item_block = "NAME: Rock\nTYPE: weapon\nEFFECT: strength:1\nCOST: 1\nDESCRIPTION: d\n"
+    catalog = tmp_path / "catalog.txt"
+    catalog.write_text(item_block + "\nITEM_ID: stick\n" + item_block)
+    
+    errors = game_data.validate_catalog(str(catalog))
+    assert [(error.line, error.message) for error in errors] == [
+        (1, "Missing required field: item_id")]
+    
+    # No ID anywhere: fall back to the file name
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(item_block)
+    assert [error.line for error in game_data.validate_catalog(str(item_file))] == [1]
+    catalog.write_text(item_block)
+    with pytest.raises(ValueError):
+        game_data.validate_catalog(str(catalog))
+    assert len(game_data.validate_catalog(str(catalog), kind="item")) == 1
+
 # ============================================================================
 # COMBAT EXCEPTION TESTS
 # ============================================================================
@@ -6,6 +6,7 @@ Tests that modules work together correctly
 import pytest
 import sys
 import os
+import re
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -14,6 +15,7 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import character_store
 
 # ============================================================================
 # CHARACTER INTEGRATION TESTS
@@ -40,6 +42,469 @@ def test_character_creation_and_saving():
     # Cleanup
     character_manager.delete_character("IntegrationTest")
 
+def test_atomic_save_keeps_old_file_on_failure(tmp_path, monkeypatch):
+    """Test that a failed save leaves the previous save intact"""
+    char = character_manager.create_character("AtomicTest", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    
+    def failing_replace(src, dst):
+        raise IOError("disk full")
+    
+    char['gold'] = 999
+    monkeypatch.setattr(character_manager.os, "replace", failing_replace)
+    with pytest.raises(IOError):
+        character_manager.save_character(char, str(tmp_path))
+    monkeypatch.undo()
+    
+    assert os.listdir(tmp_path) == ["AtomicTest_save.txt"]
+    assert character_manager.load_character("AtomicTest", str(tmp_path))['gold'] == 100
+
+def test_atomic_save_keeps_file_permissions(tmp_path):
+    """Test that atomic saves don't make save files owner-only"""
+    char = character_manager.create_character("ModeTest", "Mage")
+    save_file = tmp_path / "ModeTest_save.txt"
+    character_manager.save_character(char, str(tmp_path), fsync=False)
+    assert save_file.stat().st_mode & 0o777 == 0o666 & ~character_manager._UMASK
+    
+    os.chmod(save_file, 0o640)
+    character_manager.save_character(char, str(tmp_path), fsync=False)
+    assert save_file.stat().st_mode & 0o777 == 0o640
+
+def test_bulk_save_characters(tmp_path):
+    """Test saving many characters in one batch"""
+    chars = [character_manager.create_character(f"Bulk{i}", "Rogue") for i in range(5)]
+    
+    assert character_manager.save_characters(chars, str(tmp_path), fsync=False) == 5
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == \
+        [f"Bulk{i}" for i in range(5)]
+
+def test_sqlite_storage_backend(tmp_path):
+    """Test routing saves through the SQLite backend and migrating to it"""
+    save_dir = str(tmp_path / "saves")
+    for i in range(3):
+        char = character_manager.create_character(f"Text{i}", "Mage")
+        char['inventory'] = ["health_potion", "iron_sword"]
+        character_manager.save_character(char, save_dir, fsync=False)
+    
+    store = character_store.SQLiteBackend(str(tmp_path / "saves.db"))
+    result = character_store.migrate_storage(
+        character_manager.TextFileBackend(save_dir), store, batch_size=2
+    )
+    assert result == {'migrated': 3, 'failed': {}}
+    
+    previous = character_manager.set_storage_backend(store)
+    try:
+        assert character_manager.list_saved_characters() == ["Text0", "Text1", "Text2"]
+        assert store.list_names(limit=2) == ["Text0", "Text1"]
+        assert store.list_names(limit=2, after="Text1") == ["Text2"]
+        
+        loaded = character_manager.load_character("Text1")
+        assert loaded['class'] == "Mage"
+        assert loaded['inventory'] == ["health_potion", "iron_sword"]
+        
+        character_manager.delete_character("Text1")
+        with pytest.raises(character_store.CharacterNotFoundError):
+            character_manager.load_character("Text1")
+    finally:
+        character_manager.set_storage_backend(previous)
+        store.close()
+
+def test_sqlite_backend_keeps_equipment(tmp_path):
+    """Test that equipment and its bonuses survive the SQLite backend"""
+    import sqlite3
+    save_dir = str(tmp_path / "saves")
+    char = character_manager.create_character("Equipped", "Warrior")
+    char['inventory'] = ["iron_sword"]
+    inventory_system.equip_weapon(char, "iron_sword", {'type': 'weapon', 'effect': 'strength:5'})
+    char['equipped_armor'] = None
+    plain = character_manager.create_character("Plain", "Mage")
+    character_manager.save_characters([char, plain], save_dir, fsync=False)
+    
+    # A database from before the equipment columns is upgraded on open
+    db_path = str(tmp_path / "saves.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE characters (name TEXT PRIMARY KEY, class TEXT NOT NULL, "
+        "level INTEGER NOT NULL, health INTEGER NOT NULL, max_health INTEGER NOT NULL, "
+        "strength INTEGER NOT NULL, magic INTEGER NOT NULL, experience INTEGER NOT NULL, "
+        "gold INTEGER NOT NULL, inventory TEXT NOT NULL, active_quests TEXT NOT NULL, "
+        "completed_quests TEXT NOT NULL) WITHOUT ROWID"
+    )
+    conn.close()
+    
+    store = character_store.SQLiteBackend(db_path)
+    try:
+        result = character_store.migrate_storage(character_manager.TextFileBackend(save_dir), store)
+        assert result == {'migrated': 2, 'failed': {}}
+        loaded = store.load("Equipped")
+        assert loaded == char
+        assert store.load("Plain") == plain
+        
+        inventory_system.unequip_weapon(loaded)
+        assert loaded['strength'] == 15
+    finally:
+        store.close()
+
+def test_async_save_writer_coalesces(tmp_path, monkeypatch):
+    """Test that queued saves of one character collapse into the latest state"""
+    import threading
+    release = threading.Event()
+    real_save = character_manager.save_character
+    
+    def slow_save(character, save_directory, fsync=None):
+        release.wait(5)
+        return real_save(character, save_directory, fsync)
+    
+    monkeypatch.setattr(character_manager, "save_character", slow_save)
+    writer = character_manager.AsyncSaveWriter(str(tmp_path), fsync=False)
+    
+    char = character_manager.create_character("AsyncTest", "Warrior")
+    other = character_manager.create_character("AsyncOther", "Mage")
+    writer.save(other)                  # picked up by the worker, blocked
+    for gold in range(100, 110):
+        char['gold'] = gold
+        writer.save(char)
+    char['gold'] = 0                    # not part of any queued snapshot
+    
+    release.set()
+    writer.close()
+    
+    assert writer.written == 2
+    assert writer.coalesced == 9
+    assert character_manager.load_character("AsyncTest", str(tmp_path))['gold'] == 109
+
+def test_async_save_writer_survives_bad_character(tmp_path):
+    """Test that any save error is reported by flush() without killing the worker"""
+    writer = character_manager.AsyncSaveWriter(str(tmp_path), fsync=False)
+    try:
+        writer.save({"name": "Bad"})
+        with pytest.raises(KeyError):
+            writer.flush(timeout=5)
+        
+        writer.save(character_manager.create_character("Good", "Rogue"))
+        assert writer.flush(timeout=5)
+        assert writer.written == 1
+    finally:
+        writer.close(timeout=5)
+
+def test_character_journal_replay_and_compaction(tmp_path):
+    """Test that journaled saves append changes and replay on load"""
+    save_dir = str(tmp_path)
+    journal = character_manager.CharacterJournal(save_dir, compact_after=6, fsync=False)
+    
+    char = character_manager.create_character("JournalTest", "Rogue")
+    journal.save(char)                              # first save is a snapshot
+    char = journal.load("JournalTest")
+    
+    character_manager.add_gold(char, 50)
+    char['inventory'].append("health_potion")
+    assert journal.save(char) == 2
+    
+    character_manager.gain_experience(char, 100)   # level up: 5 stat records
+    char['completed_quests'].append("first_steps")
+    char['inventory'].remove("health_potion")
+    expected = dict(char)
+    journal_file = tmp_path / "JournalTest_journal.log"
+    assert journal.save(char) == 0                  # over the limit: compacted
+    assert journal_file.read_text().count("\n") == 1
+    
+    assert character_manager.load_character("JournalTest", save_dir) == expected
+    
+    char['gold'] += 5
+    journal.save(char)
+    with open(journal_file, "a") as f:
+        f.write("GOLD +1000")                       # torn final record is skipped
+    assert character_manager.load_character("JournalTest", save_dir)['gold'] == expected['gold'] + 5
+
+def test_character_journal_save_after_loading_plain_save(tmp_path):
+    """Test that a journal started on a save with no journal isn't lost"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("PlainSave", "Warrior")
+    character_manager.save_character(char, save_dir, fsync=False)
+    
+    journal = character_manager.CharacterJournal(save_dir, fsync=False)
+    char = journal.load("PlainSave")
+    char['gold'] += 50
+    assert journal.save(char) == 0                  # no BASE yet: snapshot
+    assert character_manager.load_character("PlainSave", save_dir)['gold'] == 150
+    
+    char['gold'] += 25
+    assert journal.save(char) == 1
+    assert character_manager.load_character("PlainSave", save_dir)['gold'] == 175
+    
+    character_manager.save_character(char, save_dir, fsync=False)   # BASE now stale
+    char = journal.load("PlainSave")
+    char['gold'] += 5
+    journal.save(char)
+    assert character_manager.load_character("PlainSave", save_dir)['gold'] == 180
+
+def test_full_save_discards_journal(tmp_path):
+    """Test that save_character() drops the journal so it isn't replayed again"""
+    save_dir = str(tmp_path)
+    journal = character_manager.CharacterJournal(save_dir, fsync=False)
+    char = character_manager.create_character("StaleJournal", "Mage")
+    journal.save(char)
+    char = journal.load("StaleJournal")
+    char['gold'] += 50
+    assert journal.save(char) == 1                  # GOLD +50
+    
+    char['gold'] -= 50                              # same text as the BASE snapshot
+    character_manager.save_character(char, save_dir, fsync=False)
+    assert not (tmp_path / "StaleJournal_journal.log").exists()
+    assert character_manager.load_character("StaleJournal", save_dir)['gold'] == 100
+    
+    char['gold'] += 7                               # journal's base was replaced
+    journal.save(char)
+    assert character_manager.load_character("StaleJournal", save_dir)['gold'] == 107
+
+def test_load_characters_reports_partial_failures(tmp_path):
+    """Test bulk loading with a thread pool and per-name errors"""
+    save_dir = str(tmp_path)
+    names = [f"Bulk{i}" for i in range(20)]
+    character_manager.save_characters(
+        [character_manager.create_character(name, "Cleric") for name in names],
+        save_dir, fsync=False
+    )
+    (tmp_path / "Bulk3_save.txt").write_text("NAME: Bulk3\nLEVEL: high\n")
+    
+    calls = []
+    characters, errors = character_manager.load_characters(
+        names + ["Missing"], save_dir, workers=4,
+        progress=lambda done, total: calls.append((done, total))
+    )
+    
+    assert list(characters) == [name for name in names if name != "Bulk3"]
+    assert characters["Bulk7"]['name'] == "Bulk7"
+    assert isinstance(errors["Bulk3"], character_store.InvalidSaveDataError)
+    assert isinstance(errors["Missing"], character_store.CharacterNotFoundError)
+    assert sorted(calls) == [(done, 21) for done in range(1, 22)]
+
+def test_binary_save_format_round_trip(tmp_path, monkeypatch):
+    """Test v2 binary saves, including journals, next to v1 text saves"""
+    save_dir = str(tmp_path)
+    text_char = character_manager.create_character("TextHero", "Mage")
+    character_manager.save_character(text_char, save_dir, fsync=False)
+    
+    monkeypatch.setattr(character_manager, "SAVE_FORMAT", "binary")
+    char = character_manager.create_character("BinaryHero", "Warrior")
+    char['inventory'] = ["health_potion"] * 20
+    character_manager.save_character(char, save_dir, fsync=False)
+    
+    data = (tmp_path / "BinaryHero_save.txt").read_bytes()
+    assert data.startswith(character_manager.SAVE_MAGIC)
+    assert len(data) < len(character_manager.format_save_data(char))
+    assert character_manager.load_character("BinaryHero", save_dir) == char
+    assert character_manager.load_character("TextHero", save_dir) == text_char
+    
+    journal = character_manager.CharacterJournal(save_dir, fsync=False)
+    journal.save(char)
+    char = journal.load("BinaryHero")
+    char['gold'] += 25
+    assert journal.save(char) == 1
+    assert character_manager.load_character("BinaryHero", save_dir)['gold'] == 125
+
+def test_bytes_save_parser_matches_text_parser(tmp_path):
+    """Test that the bytes fast path parses exactly like the text parser"""
+    samples = [
+        character_manager.format_save_data(character_manager.create_character("Fast", "Mage")),
+        "name :  Odd Case \n level: 3\nInventory: a,,b, c \nEXTRA_KEY: x:y\nno colon\n",
+        "NAME: Bad\nGOLD: 1_000\nHEALTH:  +7 \nMAGIC: ten\n",
+    ]
+    for text in samples:
+        data = text.encode("ascii")
+        assert character_manager._can_parse_bytes(data)
+        try:
+            expected = character_manager._parse_save_lines(text.split("\n"))
+        except ValueError as e:
+            with pytest.raises(ValueError, match=re.escape(str(e))):
+                character_manager._parse_save_bytes(data)
+        else:
+            assert character_manager._parse_save_bytes(data) == expected
+    
+    # Non-ASCII saves take the text path and still load
+    char = character_manager.create_character("Zoë", "Cleric")
+    character_manager.save_character(char, str(tmp_path), fsync=False)
+    assert not character_manager._can_parse_bytes(
+        (tmp_path / "Zoë_save.txt").read_bytes())
+    assert character_manager.load_character("Zoë", str(tmp_path)) == char
+
+def test_public_save_file_api(tmp_path):
+    """Test reading and writing saves by path, as the tools do"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("PathHero", "Cleric")
+    target = character_manager.save_path("PathHero", save_dir, "hashed")
+    
+    assert character_manager.write_save_file(target, char, "binary", fsync=True)
+    assert character_manager.find_save_path("PathHero", save_dir) == target
+    assert character_manager.read_save_file(target) == char
+    assert character_manager.journal_path(target) == os.path.join(
+        os.path.dirname(target), "PathHero_journal.log")
+
+def test_fsck_saves_reports_and_quarantines(tmp_path):
+    """Test the save scanner's report and quarantine of bad saves"""
+    from tools import fsck_saves
+    
+    save_dir = tmp_path / "saves"
+    good = character_manager.create_character("Good", "Warrior")
+    good['inventory'] = ["health_potion"]
+    dangling = character_manager.create_character("Dangling", "Mage")
+    dangling['inventory'] = ["health_potion", "ghost_blade"]
+    dangling['completed_quests'] = ["first_steps", "lost_quest"]
+    character_manager.save_characters([good, dangling], str(save_dir), fsync=False)
+    (save_dir / "Broken_save.txt").write_text("NAME: Broken\nLEVEL: one\n")
+    (save_dir / "Torn_save.txt").write_bytes(character_manager.SAVE_MAGIC + b"\x02")
+    
+    report = fsck_saves.scan_saves(str(save_dir), {"first_steps"}, {"health_potion"}, workers=2)
+    problems = {problem["name"]: problem for problem in report["problems"]}
+    
+    assert report["scanned"] == 4
+    assert report["counts"] == {"corrupt": 1, "invalid": 1, "references": 1}
+    assert problems["Dangling"]["unknown_items"] == ["ghost_blade"]
+    assert problems["Dangling"]["unknown_quests"] == ["lost_quest"]
+    assert problems["Torn"]["status"] == "corrupt"
+    
+    fsck_saves.quarantine(report, str(tmp_path / "quarantine"))
+    assert sorted(os.listdir(tmp_path / "quarantine")) == ["Broken_save.txt", "Torn_save.txt"]
+    assert sorted(character_manager.list_saved_characters(str(save_dir))) == ["Dangling", "Good"]
+
+def test_migrate_saves_pipeline_resumes_from_checkpoint(tmp_path):
+    """Test versioned save migration with dry run, checkpoint and format change"""
+    from tools import migrate_saves
+    
+    save_dir = str(tmp_path)
+    names = [f"Migrate{i}" for i in range(6)]
+    character_manager.save_characters(
+        [character_manager.create_character(name, "Rogue") for name in names],
+        save_dir, fsync=False
+    )
+    
+    dry = migrate_saves.migrate_saves(save_dir, workers=1, dry_run=True)
+    assert (dry["scanned"], dry["changed"]) == (6, {2: 6})
+    assert 'equipped_weapon' not in character_manager.load_character("Migrate0", save_dir)
+    
+    # An earlier run finished two saves before stopping
+    options = {"from": 1, "to": 2, "format": "binary", "layout": None}
+    migrate_saves._append_checkpoint(
+        os.path.join(save_dir, migrate_saves.CHECKPOINT_FILE), options, names[:2]
+    )
+    result = migrate_saves.migrate_saves(save_dir, save_format="binary", workers=2, batch_size=2)
+    
+    assert (result["resumed"], result["scanned"], result["failed"]) == (2, 4, {})
+    assert migrate_saves.read_schema_version(save_dir) == 2
+    assert not os.path.exists(os.path.join(save_dir, migrate_saves.CHECKPOINT_FILE))
+    migrated = character_manager.load_character("Migrate5", save_dir)
+    assert migrated['equipped_weapon'] is None and migrated['equipped_armor'] is None
+    assert (tmp_path / "Migrate5_save.txt").read_bytes().startswith(character_manager.SAVE_MAGIC)
+    assert not (tmp_path / "Migrate0_save.txt").read_bytes().startswith(character_manager.SAVE_MAGIC)
+
+def test_hashed_save_layout_and_migration(tmp_path, monkeypatch):
+    """Test the sharded save layout and moving a flat directory into it"""
+    save_dir = str(tmp_path)
+    flat = character_manager.create_character("FlatHero", "Mage")
+    character_manager.save_characters([flat], save_dir, fsync=False)
+    journal = character_manager.CharacterJournal(save_dir, fsync=False)
+    journaled = character_manager.create_character("JournalHero", "Rogue")
+    journal.save(journaled)
+    journaled = journal.load("JournalHero")
+    journaled['gold'] += 40
+    journal.save(journaled)
+    
+    monkeypatch.setattr(character_manager, "SAVE_LAYOUT", "hashed")
+    hashed = character_manager.create_character("HashedHero", "Warrior")
+    character_manager.save_character(hashed, save_dir, fsync=False)
+    
+    hashed_path = character_manager._save_path("HashedHero", save_dir)
+    assert os.path.exists(hashed_path)
+    assert os.path.relpath(hashed_path, save_dir).count(os.sep) == 2
+    
+    # Both layouts are readable before migration
+    assert sorted(character_manager.iter_saved_characters(save_dir)) == [
+        "FlatHero", "HashedHero", "JournalHero"]
+    assert character_manager.load_character("FlatHero", save_dir) == flat
+    
+    assert character_manager.migrate_save_layout(save_dir, "hashed", fsync=False) == 2
+    assert sorted(os.listdir(save_dir)) == sorted(
+        {os.path.relpath(character_manager._save_path(name, save_dir), save_dir).split(os.sep)[0]
+         for name in ("FlatHero", "HashedHero", "JournalHero")})
+    assert character_manager.load_character("JournalHero", save_dir)['gold'] == 140
+    assert sorted(character_manager.list_saved_characters(save_dir)) == [
+        "FlatHero", "HashedHero", "JournalHero"]
+    
+    character_manager.delete_character("FlatHero", save_dir)
+    with pytest.raises(character_store.CharacterNotFoundError):
+        character_manager.load_character("FlatHero", save_dir)
+
+def test_saving_in_new_layout_removes_old_copy(tmp_path, monkeypatch):
+    """Test that a save written after a layout switch replaces the old copy"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("SwitchHero", "Mage")
+    journal = character_manager.CharacterJournal(save_dir, fsync=False)
+    journal.save(char)
+    flat_path = character_manager._save_path("SwitchHero", save_dir, "flat")
+    
+    monkeypatch.setattr(character_manager, "SAVE_LAYOUT", "hashed")
+    char['gold'] = 250
+    character_manager.save_character(char, save_dir, fsync=False)
+    assert not os.path.exists(flat_path)
+    assert not os.path.exists(character_manager._journal_path("SwitchHero", None, flat_path))
+    assert character_manager.list_saved_characters(save_dir) == ["SwitchHero"]
+    
+    monkeypatch.setattr(character_manager, "SAVE_LAYOUT", "flat")
+    assert character_manager.load_character("SwitchHero", save_dir)['gold'] == 250
+    character_manager.save_characters([char], save_dir, fsync=False)
+    assert not os.path.exists(character_manager._save_path("SwitchHero", save_dir, "hashed"))
+    assert character_manager.list_saved_characters(save_dir) == ["SwitchHero"]
+
+def test_character_cache_lru_write_back(tmp_path):
+    """Test cache hits, LRU eviction with write-back and stale invalidation"""
+    save_dir = str(tmp_path)
+    for name in ("CacheA", "CacheB", "CacheC"):
+        character_manager.save_character(
+            character_manager.create_character(name, "Cleric"), save_dir, fsync=False
+        )
+    
+    cache = character_manager.CharacterCache(max_size=2, save_directory=save_dir, fsync=False)
+    a = cache.get("CacheA")
+    assert cache.get("CacheA") is a
+    a['gold'] = 555
+    cache.put(a)
+    
+    cache.get("CacheB")
+    cache.get("CacheC")                 # evicts CacheA, writing it back
+    assert "CacheA" not in cache
+    assert character_manager.load_character("CacheA", save_dir)['gold'] == 555
+    
+    # Another process rewrites CacheB: the cached copy is dropped
+    b = character_manager.load_character("CacheB", save_dir)
+    b['gold'] = 7
+    character_manager.save_character(b, save_dir, fsync=False)
+    os.utime(tmp_path / "CacheB_save.txt", ns=(1, 1))
+    assert cache.get("CacheB")['gold'] == 7
+    
+    assert cache.stats() == {'size': 2, 'hits': 1, 'misses': 4, 'evictions': 1,
+                             'writebacks': 1, 'invalidations': 1}
+
+def test_character_cache_keeps_dirty_entry_when_write_back_fails(tmp_path, monkeypatch):
+    """Test that an evicted character whose save fails isn't dropped"""
+    save_dir = str(tmp_path)
+    cache = character_manager.CharacterCache(max_size=1, save_directory=save_dir, fsync=False)
+    a = character_manager.create_character("CacheFailA", "Rogue")
+    a['gold'] = 321
+    cache.put(a)
+    
+    def failing_save(character, save_directory, fsync=None):
+        raise IOError("disk full")
+    
+    monkeypatch.setattr(character_manager, "save_character", failing_save)
+    with pytest.raises(IOError):
+        cache.put(character_manager.create_character("CacheFailB", "Rogue"))
+    assert "CacheFailA" in cache
+    assert cache.stats()['evictions'] == 0
+    monkeypatch.undo()
+    
+    assert cache.flush() == 2
+    assert character_manager.load_character("CacheFailA", save_dir)['gold'] == 321
+
 def test_character_leveling_system():
     """Test that character leveling works correctly"""
     char = character_manager.create_character("LevelTest", "Mage")
@@ -54,6 +519,30 @@ def test_character_leveling_system():
     assert char['max_health'] > original_health
     assert char['health'] == char['max_health']  # Health restored on level up
 
+def test_bulk_experience_matches_level_by_level():
+    """Test that closed-form leveling matches leveling one step at a time"""
+    def reference(level, experience):
+        levels = 0
+        while experience >= level * 100:
+            experience -= level * 100
+            level += 1
+            levels += 1
+        return levels, level, experience
+    
+    for start_level in (1, 2, 7, 50):
+        for xp in (0, 99, 100, 250, 299, 300, 1234, 5050, 10 ** 6, 10 ** 9 + 7):
+            char = character_manager.create_character("BulkXP", "Warrior")
+            char['level'] = start_level
+            char['experience'] = 37
+            levels, level, experience = reference(start_level, 37 + xp)
+            
+            summary = character_manager.gain_experience(char, xp)
+            
+            assert summary['levels_gained'] == levels
+            assert (char['level'], char['experience']) == (level, experience)
+            assert char['strength'] == 15 + 2 * levels
+            assert char['max_health'] == 120 + 10 * levels
+
 def test_character_gold_management():
     """Test adding and spending gold"""
     char = character_manager.create_character("GoldTest", "Rogue")
@@ -69,6 +558,103 @@ def test_character_gold_management():
     with pytest.raises(ValueError):
         character_manager.add_gold(char, -1000)
 
+def test_compact_character_dict_compatible(tmp_path):
+    """Test that slotted characters work with the game modules and saves"""
+    original = character_manager.create_character("Slotted", "Warrior")
+    char = character_manager.compact_character(original)
+    
+    assert not hasattr(char, '__dict__')
+    assert char == original
+    assert 'equipped_weapon' not in char
+    
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.equip_weapon(char, "iron_sword", {'type': 'weapon', 'effect': 'strength:5'})
+    assert char['strength'] == 20 and char['equipped_weapon'] == "iron_sword"
+    inventory_system.unequip_weapon(char)
+    assert 'weapon_bonus' not in char and char['strength'] == 15
+    
+    quests = {'q1': {'quest_id': 'q1', 'required_level': 1, 'prerequisite': 'NONE',
+                     'reward_xp': 100, 'reward_gold': 10}}
+    quest_handler.accept_quest(char, 'q1', quests)
+    quest_handler.complete_quest(char, 'q1', quests)
+    assert char['completed_quests'] == ['q1'] and char['level'] == 2
+    
+    with pytest.raises(KeyError):
+        char['mana'] = 5
+    
+    character_manager.save_character(char, str(tmp_path), fsync=False)
+    loaded = character_manager.load_character("Slotted", str(tmp_path))
+    assert loaded == {key: char[key] for key in loaded}
+
+def test_character_population_matches_scalar_operations():
+    """Test that vectorized population updates match the scalar functions"""
+    pytest.importorskip("numpy")
+    import character_population
+    
+    characters = []
+    for i, character_class in enumerate(["Warrior", "Mage", "Rogue", "Cleric"] * 5):
+        char = character_manager.create_character(f"Pop{i}", character_class)
+        char['level'] = 1 + i * 3
+        char['health'] = (i * 17) % char['max_health'] + 1
+        characters.append(char)
+    population = character_population.CharacterPopulation.from_characters(characters)
+    
+    xp = [i * 997 for i in range(len(characters))]
+    population.gain_experience(xp)
+    population.add_gold(-50)
+    for char, amount in zip(characters, xp):
+        character_manager.gain_experience(char, amount)
+        character_manager.add_gold(char, -50)
+        char['health'] = max(0, char['health'] - 60)
+    
+    population.stats['health'] = [char['health'] for char in characters]
+    healed = population.heal(15)
+    revived = population.revive()
+    expected_healed = [character_manager.heal_character(char, 15) for char in characters]
+    expected_revived = [character_manager.revive_character(char) for char in characters]
+    
+    assert healed.tolist() == expected_healed
+    assert revived.tolist() == expected_revived
+    assert population.to_characters() == characters
+    
+    with pytest.raises(ValueError):
+        population.add_gold(-10 ** 6)
+
+def test_character_snapshot_copy_on_write():
+    """Test speculative trials with snapshot restore and commit"""
+    char = character_manager.create_character("Trial", "Warrior")
+    inventory_system.add_item_to_inventory(char, "health_potion")
+    original = {key: list(value) if isinstance(value, list) else value
+                for key, value in char.items()}
+    inventory = char['inventory']
+    quests = {'q1': {'quest_id': 'q1', 'required_level': 1, 'prerequisite': 'NONE',
+                     'reward_xp': 250, 'reward_gold': 40}}
+    
+    with character_manager.snapshot_character(char) as snapshot:
+        for _ in range(3):
+            inventory_system.purchase_item(char, "iron_sword", {'cost': 30})
+            quest_handler.accept_quest(char, 'q1', quests)
+            quest_handler.complete_quest(char, 'q1', quests)
+            char['health'] -= 50
+            assert char['level'] == 2 and char['completed_quests'] == ['q1']
+            assert inventory == ["health_potion"]       # shared list never changed
+            snapshot.restore()
+            assert char == original and char['inventory'] is inventory
+        
+        inventory_system.remove_item_from_inventory(char, "health_potion")
+    assert char == original                             # undone on exit
+    
+    with character_manager.snapshot_character(char) as snapshot:
+        character_manager.add_gold(char, 5)
+        inventory_system.add_item_to_inventory(char, "iron_sword")
+        snapshot.commit()
+    assert char['gold'] == 105 and char['inventory'] == ["health_potion", "iron_sword"]
+    
+    # Without a live snapshot lists are changed in place, not copied
+    inventory = char['inventory']
+    inventory_system.remove_item_from_inventory(char, "iron_sword")
+    assert char['inventory'] is inventory
+
 # ============================================================================
 # INVENTORY INTEGRATION TESTS
 # ============================================================================
@@ -104,6 +690,59 @@ def test_equipment_system():
     assert 'equipped_weapon' in char
     assert char['equipped_weapon'] == "iron_sword"
 
+def test_multi_effect_item_equip_and_unequip():
+    """Test that compiled multi-stat effects are applied and removed"""
+    char = character_manager.create_character("MultiEffectTest", "Mage")
+    original_strength = char['strength']
+    original_magic = char['magic']
+    
+    lines = ["ITEM_ID: battle_staff", "NAME: Battle Staff", "TYPE: weapon",
+             "EFFECT: strength:5,magic:2", "COST: 300", "DESCRIPTION: Both"]
+    staff = game_data.build_item(lines)
+    assert staff['effects'] == (game_data.ItemEffect('strength', 5),
+                                game_data.ItemEffect('magic', 2))
+    
+    inventory_system.add_item_to_inventory(char, "battle_staff")
+    inventory_system.equip_weapon(char, "battle_staff", staff)
+    assert char['strength'] == original_strength + 5
+    assert char['magic'] == original_magic + 2
+    
+    inventory_system.unequip_weapon(char)
+    assert char['strength'] == original_strength
+    assert char['magic'] == original_magic
+
+def test_equipment_bonus_survives_save_and_load(tmp_path, monkeypatch):
+    """Test that unequipping after a load removes the bonus it added"""
+    save_dir = str(tmp_path)
+    sword = {'type': 'weapon', 'effect': 'strength:5,magic:2'}
+    plate = {'type': 'armor', 'effect': 'max_health:10'}
+    char = character_manager.create_character("BonusTest", "Warrior")
+    char['inventory'] = ["iron_sword", "steel_plate"]
+    inventory_system.equip_weapon(char, "iron_sword", sword)
+    inventory_system.equip_armor(char, "steel_plate", plate)
+    character_manager.save_character(char, save_dir, fsync=False)
+    
+    for save_format in ("text", "binary"):
+        monkeypatch.setattr(character_manager, "SAVE_FORMAT", save_format)
+        loaded = character_manager.load_character("BonusTest", save_dir)
+        assert loaded == char
+        for _ in range(2):
+            inventory_system.unequip_weapon(loaded)
+            assert loaded['strength'] == 15 and loaded['magic'] == 5
+            inventory_system.equip_weapon(loaded, "iron_sword", sword)
+            assert loaded['strength'] == 20
+        character_manager.save_character(loaded, save_dir, fsync=False)
+    
+    # Journaled: unequipping records the bonus removal
+    journal = character_manager.CharacterJournal(save_dir, fsync=False)
+    journal.compact(char)
+    char = journal.load("BonusTest")
+    inventory_system.unequip_armor(char)
+    assert journal.save(char) > 0
+    loaded = character_manager.load_character("BonusTest", save_dir)
+    assert 'armor_bonus' not in loaded and loaded['max_health'] == 120
+    assert loaded['weapon_bonus'] == (("strength", 5), ("magic", 2))
+
 def test_shop_system():
     """Test buying and selling items"""
     char = character_manager.create_character("ShopTest", "Mage")
@@ -249,6 +888,214 @@ def test_load_game_data():
         assert 'type' in item
         assert 'cost' in item
 
+def test_catalog_cache_roundtrip(tmp_path):
+    """Test that the compiled catalog cache is reused and rebuilt when stale"""
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(open("data/items.txt").read())
+    cache_file = tmp_path / "items.txt.cache"
+    
+    fresh = game_data.load_items(str(item_file), use_cache=True)
+    assert cache_file.exists()
+    assert game_data.load_items(str(item_file), use_cache=True) == fresh
+    
+    # A corrupt cache is silently rebuilt
+    cache_file.write_bytes(b"not a cache")
+    assert game_data.load_items(str(item_file), use_cache=True) == fresh
+    
+    # Editing the source invalidates the cache
+    item_file.write_text(
+        "ITEM_ID: pebble\nNAME: Pebble\nTYPE: consumable\n"
+        "EFFECT: health:1\nCOST: 1\nDESCRIPTION: A pebble\n"
+    )
+    assert list(game_data.load_items(str(item_file), use_cache=True)) == ['pebble']
+
+def test_lazy_catalog_matches_eager_load(tmp_path):
+    """Test that LazyCatalog can stand in for the loaded quest dictionary"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(open("data/quests.txt").read())
+    quests = game_data.load_quests(str(quest_file))
+    
+    with game_data.LazyCatalog(str(quest_file), "quest") as lazy:
+        assert len(lazy) == len(quests)
+        assert set(lazy) == set(quests)
+        assert 'first_steps' in lazy
+        assert lazy['first_steps'] == quests['first_steps']
+        assert quest_handler.get_quest_prerequisite_chain('goblin_hunter', lazy) == \
+            ['first_steps', 'goblin_hunter']
+    
+    # Parsed records outlive close(); unparsed ones fail clearly
+    assert lazy['first_steps'] == quests['first_steps']
+    unparsed = sorted(set(quests) - {'first_steps', 'goblin_hunter'})[0]
+    with pytest.raises(ValueError, match="closed"):
+        lazy[unparsed]
+    
+    # The offset index is persisted and reused
+    assert (tmp_path / "quests.txt.idx").exists()
+    with game_data.LazyCatalog(str(quest_file), "quest") as lazy:
+        assert dict(lazy.items()) == quests
+
+def test_lazy_catalog_rebuilds_index_for_same_size_rewrite(tmp_path):
+    """Test that a stale offset index never returns another record"""
+    def block(item_id):
+        return (f"ITEM_ID: {item_id}\nNAME: {item_id}\nTYPE: consumable\n"
+                "EFFECT: health:1\nCOST: 1\nDESCRIPTION: d\n")
+    
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(block("aaa") + "\n" + block("bb"))
+    with game_data.LazyCatalog(str(item_file), "item") as lazy:
+        assert lazy['aaa']['item_id'] == 'aaa'
+    
+    # Swap the blocks without changing the size or mtime
+    stat = item_file.stat()
+    item_file.write_text(block("bb") + "\n" + block("aaa"))
+    os.utime(item_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    
+    with game_data.LazyCatalog(str(item_file), "item") as lazy:
+        assert lazy['aaa']['item_id'] == 'aaa'
+        assert lazy['bb']['item_id'] == 'bb'
+    with game_data.LazyCatalog(str(item_file), "item") as lazy:
+        assert lazy['bb']['item_id'] == 'bb'     # the rebuilt index was persisted
+
+def test_load_sharded_catalog_directory(tmp_path):
+    """Test merging catalog shards and rejecting duplicate IDs"""
+    blocks = open("data/items.txt").read().strip().split("\n\n")
+    for i, block in enumerate(blocks):
+        (tmp_path / f"items_{i:02d}.txt").write_text(block + "\n")
+    
+    items = game_data.load_items_dir(str(tmp_path), workers=2)
+    assert items == game_data.load_items("data/items.txt")
+    
+    (tmp_path / "items_99.txt").write_text(blocks[0] + "\n")
+    with pytest.raises(game_data.InvalidDataFormatError, match="items_99.txt"):
+        game_data.load_items_dir(str(tmp_path), workers=2)
+
+def test_catalog_watcher_reloads_changed_blocks(tmp_path):
+    """Test that hot reload publishes a diff and a fresh snapshot"""
+    blocks = open("data/items.txt").read().strip().split("\n\n")
+    item_file = tmp_path / "items.txt"
+    item_file.write_text("\n\n".join(blocks) + "\n")
+    
+    watcher = game_data.CatalogWatcher(str(item_file), "item")
+    old_snapshot = watcher.snapshot
+    diffs = []
+    watcher.subscribe(diffs.append)
+    assert watcher.poll() is None
+    
+    # Change the first item, drop the second, add a new one
+    blocks[0] = blocks[0].replace("COST: 25", "COST: 30")
+    removed_id = blocks[1].split("\n")[0].split(": ")[1]
+    del blocks[1]
+    blocks.append("ITEM_ID: pebble\nNAME: Pebble\nTYPE: consumable\n"
+                  "EFFECT: health:1\nCOST: 1\nDESCRIPTION: A pebble")
+    item_file.write_text("\n\n".join(blocks) + "\n")
+    
+    diff = watcher.reload()
+    assert diff == {'added': ['pebble'], 'removed': [removed_id], 'changed': ['health_potion']}
+    assert diffs == [diff]
+    assert watcher.snapshot['health_potion']['cost'] == 30
+    assert old_snapshot['health_potion']['cost'] == 25
+    # Unchanged blocks are reused, not re-parsed
+    assert watcher.snapshot['iron_sword'] is old_snapshot['iron_sword']
+
+def test_catalog_watcher_seeds_adopted_catalog_in_background(tmp_path):
+    """Test that adopting a loaded catalog defers hashing to the watcher thread"""
+    import time
+    item_file = tmp_path / "items.txt"
+    item_file.write_text(open("data/items.txt").read())
+    items = game_data.load_items(str(item_file))
+    
+    watcher = game_data.CatalogWatcher(str(item_file), "item", items)
+    assert watcher.snapshot is items
+    assert not watcher._block_hashes            # nothing read on the caller's thread
+    
+    watcher.start(interval=60)
+    try:
+        deadline = time.monotonic() + 5
+        while not watcher._block_hashes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert set(watcher._block_hashes) == set(items)
+    finally:
+        watcher.stop()
+    
+    item_file.write_text(item_file.read_text().replace("COST: 25\n", "COST: 30\n"))
+    assert watcher.reload()['changed'] == ['health_potion']
+    assert watcher.snapshot['iron_sword'] is items['iron_sword']
+    
+    # A file that changed before seeding ran is fully re-parsed instead
+    stale = game_data.CatalogWatcher(str(item_file), "item", items)
+    item_file.write_text(item_file.read_text() + "\n")
+    os.utime(item_file, ns=(1, 1))
+    stale._seed()
+    assert not stale._block_hashes
+    assert sorted(stale.reload()['changed']) == sorted(items)
+    assert stale.snapshot['health_potion']['cost'] == 30
+
+def test_compact_catalog_records():
+    """Test that slotted Quest/Item records work like the catalog dicts"""
+    quests = game_data.load_quests("data/quests.txt")
+    items = game_data.load_items("data/items.txt")
+    compact_quests = game_data.compact_quests(quests)
+    compact_items = game_data.compact_items(items)
+    
+    assert compact_quests == quests
+    assert compact_items['iron_sword']['cost'] == items['iron_sword']['cost']
+    assert compact_items['iron_sword'].get('missing', 'default') == 'default'
+    assert 'reward_xp' in compact_quests['first_steps']
+    
+    char = character_manager.create_character("CompactTest", "Warrior")
+    quest_handler.accept_quest(char, 'first_steps', compact_quests)
+    rewards = quest_handler.complete_quest(char, 'first_steps', compact_quests)
+    assert rewards['xp'] == quests['first_steps']['reward_xp']
+    
+    inventory_system.purchase_item(char, 'iron_sword', compact_items['iron_sword'])
+    inventory_system.equip_weapon(char, 'iron_sword', compact_items['iron_sword'])
+    assert char['equipped_weapon'] == 'iron_sword'
+
+def test_catalog_index_range_queries():
+    """Test level and cost range queries against a full scan"""
+    quests = game_data.load_quests("data/quests.txt")
+    items = game_data.load_items("data/items.txt")
+    index = game_data.CatalogIndex(quests, items)
+    
+    by_scan = [q for q in quests.values() if 2 <= q['required_level'] <= 4]
+    by_index = quest_handler.get_quests_by_level(quests, 2, 4, catalog_index=index)
+    assert sorted(q['quest_id'] for q in by_index) == sorted(q['quest_id'] for q in by_scan)
+    assert [q['required_level'] for q in by_index] == sorted(q['required_level'] for q in by_scan)
+    
+    # Without an explicit index one is built once per catalog and reused
+    assert quest_handler.get_quests_by_level(quests, 2, 4) == by_index
+    cached = quest_handler._level_index[2]
+    quest_handler.get_quests_by_level(quests, 1, 1)
+    assert quest_handler._level_index[2] is cached
+    reloaded = dict(quests)
+    assert quest_handler.get_quests_by_level(reloaded, 2, 4) == by_index
+    assert quest_handler._level_index[2] is not cached
+    
+    weapons = index.items_by_cost(max_cost=200, item_type='weapon')
+    expected = [i for i in items.values() if i['type'] == 'weapon' and i['cost'] <= 200]
+    assert sorted(i['item_id'] for i in weapons) == sorted(i['item_id'] for i in expected)
+    assert [i['cost'] for i in weapons] == sorted(i['cost'] for i in expected)
+    assert len(index.items_by_cost()) == len(items)
+    assert index.items_of_type('nonexistent') == []
+
+def test_generated_dataset_loads(tmp_path):
+    """Test that the benchmark data generator writes valid game files"""
+    from benchmarks.generate_data import generate_dataset
+    
+    dataset = generate_dataset(str(tmp_path), 50, 30, 5)
+    quests = game_data.load_quests(dataset['quests'])
+    items = game_data.load_items(dataset['items'])
+    
+    assert len(quests) == 50
+    assert len(items) == 30
+    assert quest_handler.validate_quest_prerequisites(quests)
+    
+    saved = character_manager.list_saved_characters(dataset['save_directory'])
+    assert sorted(saved) == sorted(dataset['characters'])
+    for name in saved:
+        character = character_manager.load_character(name, dataset['save_directory'])
+        assert set(character['inventory']) <= set(items)
+
 def test_data_validation():
     """Test that data validation works"""
     valid_quest = {
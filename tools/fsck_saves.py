@@ -0,0 +1,213 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Directory Integrity Scanner
+
+Parses and validates every save file in a save directory (flat or hashed
+layout) on a process pool, and cross-checks inventory items and quest IDs
+against the item and quest catalogs. Prints a JSON report of every file
+with a problem and exits with status 1 if there are any.
+
+Problems reported per file:
+    corrupt     - unreadable, truncated or failed checksum (SaveFileCorruptedError)
+    invalid     - parses but has missing or malformed fields (InvalidSaveDataError)
+    references  - loads, but refers to unknown items/quests, names a quest as
+                  both active and completed, or its NAME doesn't match the file
+
+With --quarantine, corrupt and invalid saves (and their journals) are
+moved into the given directory, keeping their path relative to the save
+directory, so the game no longer sees them.
+
+Usage:
+    python tools/fsck_saves.py
+    python tools/fsck_saves.py --save-dir data/save_games --workers 8 --output report.json
+    python tools/fsck_saves.py --quarantine data/quarantine
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import character_manager
+from custom_exceptions import DataError, SaveFileCorruptedError, InvalidSaveDataError
+
+SAVE_SUFFIX = "_save.txt"
+
+# Catalog IDs for worker processes, set by _init_worker
+_quest_ids = frozenset()
+_item_ids = frozenset()
+
+def iter_save_files(save_directory, skip=None):
+    """
+    Yield the path of every save file under save_directory
+    
+    Args:
+        save_directory: Directory to walk (any depth, so both layouts work)
+        skip: Directory to leave out, e.g. a quarantine inside save_directory
+    """
+    skip = os.path.abspath(skip) if skip else None
+    for root, dirs, files in os.walk(save_directory):
+        if skip is not None:
+            dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != skip]
+        for filename in files:
+            if filename.endswith(SAVE_SUFFIX):
+                yield os.path.join(root, filename)
+
+def check_save(filepath, quest_ids=None, item_ids=None):
+    """
+    Check one save file
+    
+    Args:
+        filepath: Path of the save file
+        quest_ids: Known quest IDs (None = the worker's catalog)
+        item_ids: Known item IDs (None = the worker's catalog)
+    
+    Returns: Problem dictionary for the report, or None if the save is fine
+    """
+    quest_ids = _quest_ids if quest_ids is None else quest_ids
+    item_ids = _item_ids if item_ids is None else item_ids
+    name = os.path.basename(filepath)[:-len(SAVE_SUFFIX)]
+    problem = {"path": filepath, "name": name}
+    
+    try:
+        character = character_manager.read_save_file(filepath, name)
+    except SaveFileCorruptedError as e:
+        problem.update(status="corrupt", error=str(e))
+        return problem
+    except InvalidSaveDataError as e:
+        problem.update(status="invalid", error=str(e))
+        return problem
+    
+    active = set(character['active_quests'])
+    completed = set(character['completed_quests'])
+    issues = {}
+    unknown_items = set(character['inventory']) - item_ids
+    if unknown_items:
+        issues["unknown_items"] = sorted(unknown_items)
+    unknown_quests = (active | completed) - quest_ids
+    if unknown_quests:
+        issues["unknown_quests"] = sorted(unknown_quests)
+    both = active & completed
+    if both:
+        issues["active_and_completed"] = sorted(both)
+    if character['name'] != name:
+        issues["name_mismatch"] = character['name']
+    
+    if not issues:
+        return None
+    problem.update(status="references", **issues)
+    return problem
+
+def scan_saves(save_directory, quest_ids, item_ids, workers=None, skip=None):
+    """
+    Check every save file in a directory
+    
+    Args:
+        save_directory: Directory containing save files
+        quest_ids: Set of known quest IDs
+        item_ids: Set of known item IDs
+        workers: Process pool size (1 = check in this process)
+        skip: Directory under save_directory not to scan
+    
+    Returns: Report dictionary {'save_directory', 'scanned', 'counts', 'problems'}
+    """
+    paths = list(iter_save_files(save_directory, skip))
+    quest_ids = frozenset(quest_ids)
+    item_ids = frozenset(item_ids)
+    
+    if workers == 1 or len(paths) <= 1:
+        results = [check_save(path, quest_ids, item_ids) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(quest_ids, item_ids)) as pool:
+            chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 8))
+            results = list(pool.map(check_save, paths, chunksize=chunksize))
+    
+    problems = [result for result in results if result is not None]
+    counts = {"corrupt": 0, "invalid": 0, "references": 0}
+    for problem in problems:
+        counts[problem["status"]] += 1
+    
+    return {
+        "save_directory": save_directory,
+        "scanned": len(paths),
+        "counts": counts,
+        "problems": problems,
+    }
+
+def quarantine(report, quarantine_directory):
+    """
+    Move corrupt and invalid saves (and their journals) out of the way
+    
+    Args:
+        report: Report from scan_saves()
+        quarantine_directory: Destination directory
+    
+    Returns: List of paths moved
+    """
+    save_directory = report["save_directory"]
+    moved = []
+    for problem in report["problems"]:
+        if problem["status"] not in ("corrupt", "invalid"):
+            continue
+        
+        save_path = problem["path"]
+        journal_path = character_manager.journal_path(save_path)
+        for path in (save_path, journal_path):
+            if not os.path.exists(path):
+                continue
+            target = os.path.join(quarantine_directory, os.path.relpath(path, save_directory))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(path, target)
+            moved.append(path)
+        problem["quarantined"] = True
+    return moved
+
+def _init_worker(quest_ids, item_ids):
+    """Give a worker process the catalog IDs once instead of per file"""
+    global _quest_ids, _item_ids
+    _quest_ids = quest_ids
+    _item_ids = item_ids
+
+def _load_catalog_ids(path, load_file, load_dir):
+    """Return the record IDs of a catalog file or shard directory"""
+    if os.path.isdir(path):
+        return set(load_dir(path))
+    return set(load_file(path))
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Check save files for corruption and bad references")
+    parser.add_argument("--save-dir", default="data/save_games")
+    parser.add_argument("--quests", default="data/quests.txt", help="Quest file or shard directory")
+    parser.add_argument("--items", default="data/items.txt", help="Item file or shard directory")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--quarantine", help="Move corrupt and invalid saves into this directory")
+    args = parser.parse_args(argv)
+    
+    try:
+        quest_ids = _load_catalog_ids(args.quests, game_data.load_quests, game_data.load_quests_dir)
+        item_ids = _load_catalog_ids(args.items, game_data.load_items, game_data.load_items_dir)
+    except DataError as e:
+        print(f"Could not load catalogs: {e}", file=sys.stderr)
+        return 2
+    
+    report = scan_saves(args.save_dir, quest_ids, item_ids, args.workers, skip=args.quarantine)
+    if args.quarantine:
+        quarantine(report, args.quarantine)
+    
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 1 if report["problems"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,32 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Directory Layout Migration
+
+Moves every text save in a save directory into the flat layout
+({name}_save.txt) or the hashed layout (ab/cd/{name}_save.txt). Safe to
+run while the game is using the directory; set
+character_manager.SAVE_LAYOUT to the new layout so new saves go there too.
+
+Usage: python tools/migrate_save_layout.py [save_directory] [flat|hashed]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+def main(argv):
+    save_directory = argv[0] if len(argv) > 0 else "data/save_games"
+    layout = argv[1] if len(argv) > 1 else "hashed"
+    if layout not in character_manager.SAVE_LAYOUTS:
+        print(__doc__)
+        return 2
+    
+    moved = character_manager.migrate_save_layout(save_directory, layout)
+    print(f"Moved {moved} characters to the {layout} layout")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
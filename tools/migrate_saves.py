@@ -0,0 +1,285 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Migration Pipeline
+
+Rewrites every text save in a save directory through the registered,
+versioned transforms (see TRANSFORMS), optionally converting it to another
+save format and/or directory layout at the same time.
+
+Saves are streamed from the directory in batches and migrated on a
+process pool; each one is written back atomically (any journal is folded
+in). The names finished so far are appended to a checkpoint file after
+every batch, so an interrupted run picks up where it stopped when started
+again with the same options. When every save has been migrated the
+directory's schema version is recorded in SCHEMA_VERSION_FILE and the
+checkpoint is removed.
+
+--dry-run reads and transforms everything without writing and reports
+throughput and how many saves each transform would change.
+
+Unlike migrate_save_layout.py, run this with the game stopped: saves are
+read, transformed and rewritten, so a concurrent save could be lost.
+
+Usage:
+    python tools/migrate_saves.py --dry-run
+    python tools/migrate_saves.py --save-dir data/save_games --workers 8
+    python tools/migrate_saves.py --format binary --layout hashed
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+
+# Per-directory file holding the schema version the saves were migrated to;
+# directories without one are at version 1 (the original save format)
+SCHEMA_VERSION_FILE = ".save_schema_version"
+CHECKPOINT_FILE = ".migrate_checkpoint"
+
+# Registered transforms as (version, description, function), in version
+# order. A transform takes a character dict, updates it in place and
+# brings it from version - 1 to version.
+TRANSFORMS = []
+
+def transform(version, description):
+    """Register a function as the transform to the given schema version"""
+    def register(func):
+        if TRANSFORMS and version <= TRANSFORMS[-1][0]:
+            raise ValueError(f"Transform versions must increase (got {version})")
+        TRANSFORMS.append((version, description, func))
+        return func
+    return register
+
+@transform(2, "Store equipped weapon and armor in the save")
+def add_equipment_fields(character):
+    character.setdefault('equipped_weapon', None)
+    character.setdefault('equipped_armor', None)
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def latest_version():
+    """Return the schema version the newest transform produces"""
+    return TRANSFORMS[-1][0] if TRANSFORMS else 1
+
+def read_schema_version(save_directory):
+    """Return the schema version recorded for a save directory (default 1)"""
+    try:
+        with open(os.path.join(save_directory, SCHEMA_VERSION_FILE)) as file:
+            return int(file.read().strip())
+    except FileNotFoundError:
+        return 1
+
+def migrate_save(name, save_directory, from_version, to_version,
+                 save_format=None, layout=None, dry_run=False, fsync=False):
+    """
+    Migrate one character's save
+    
+    Args:
+        name: Character name
+        save_directory: Directory containing save files
+        from_version: Schema version the save is at
+        to_version: Schema version to migrate to
+        save_format: "text" or "binary" to write (None = SAVE_FORMAT)
+        layout: "flat" or "hashed" to write to (None = SAVE_LAYOUT)
+        dry_run: Only work out what would change
+        fsync: Flush each rewritten save to disk
+    
+    Returns: Tuple of (name, versions_that_changed_the_save, error_message)
+    """
+    try:
+        source = character_manager.find_save_path(name, save_directory)
+        if source is None:
+            raise CharacterNotFoundError(f"Character {name} not found.")
+        character = character_manager.read_save_file(source, name)
+    except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+        return name, [], str(e)
+    
+    changed = []
+    for version, description, func in TRANSFORMS:
+        if from_version < version <= to_version:
+            before = character_manager.format_save_data(character)
+            func(character)
+            if character_manager.format_save_data(character) != before:
+                changed.append(version)
+    
+    if dry_run:
+        return name, changed, None
+    
+    target = character_manager.save_path(name, save_directory, layout)
+    journal = character_manager.journal_path(source)
+    character_manager.write_save_file(target, character, save_format, fsync)
+    for path in (journal, source if source != target else None):
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+    return name, changed, None
+
+def migrate_saves(save_directory="data/save_games", to_version=None, save_format=None,
+                  layout=None, workers=None, batch_size=1000, dry_run=False,
+                  fsync=False, checkpoint=None):
+    """
+    Migrate every save in a directory, resuming from a checkpoint
+    
+    Args:
+        save_directory: Directory containing save files
+        to_version: Schema version to migrate to (None = latest)
+        save_format: Save format to write (None = SAVE_FORMAT)
+        layout: Directory layout to write (None = SAVE_LAYOUT)
+        workers: Process pool size (1 = migrate in this process)
+        batch_size: Saves handed to the pool between checkpoints
+        dry_run: Report what would change without writing anything
+        fsync: Flush each rewritten save to disk
+        checkpoint: Checkpoint file (None = CHECKPOINT_FILE in save_directory)
+    
+    Returns: Dictionary with 'from_version', 'to_version', 'scanned',
+             'changed' {version: count}, 'resumed', 'failed' {name: error},
+             'seconds' and 'saves_per_second'
+    """
+    from_version = read_schema_version(save_directory)
+    to_version = latest_version() if to_version is None else to_version
+    checkpoint = checkpoint or os.path.join(save_directory, CHECKPOINT_FILE)
+    options = {"from": from_version, "to": to_version, "format": save_format, "layout": layout}
+    
+    done = set() if dry_run else _read_checkpoint(checkpoint, options)
+    resumed = len(done)
+    result = {
+        "from_version": from_version, "to_version": to_version, "scanned": 0,
+        "changed": {version: 0 for version, _, _ in TRANSFORMS
+                    if from_version < version <= to_version},
+        "resumed": resumed, "failed": {},
+    }
+    start = time.perf_counter()
+    args = (save_directory, from_version, to_version, save_format, layout, dry_run, fsync)
+    
+    pool = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        for batch in _batches(character_manager.iter_saved_characters(save_directory),
+                              done, batch_size):
+            if pool is None:
+                outcomes = [migrate_save(name, *args) for name in batch]
+            else:
+                futures = [pool.submit(migrate_save, name, *args) for name in batch]
+                outcomes = [future.result() for future in futures]
+            
+            finished = []
+            for name, changed, error in outcomes:
+                result["scanned"] += 1
+                if error is not None:
+                    result["failed"][name] = error
+                    continue
+                for version in changed:
+                    result["changed"][version] += 1
+                finished.append(name)
+            
+            if not dry_run:
+                _append_checkpoint(checkpoint, options, finished)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    
+    if not dry_run and not result["failed"]:
+        _write_schema_version(save_directory, to_version)
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+    
+    result["seconds"] = time.perf_counter() - start
+    result["saves_per_second"] = result["scanned"] / result["seconds"] if result["seconds"] else 0.0
+    return result
+
+def _write_schema_version(save_directory, version):
+    """Atomically record the schema version a save directory is at"""
+    path = os.path.join(save_directory, SCHEMA_VERSION_FILE)
+    with open(path + ".tmp", "w") as file:
+        file.write(f"{version}\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+
+def _batches(names, done, batch_size):
+    """
+    Yield lists of up to batch_size names that aren't in done
+    
+    Names are added to done as they're batched, so a save the directory
+    listing returns again after it was rewritten isn't migrated twice.
+    """
+    batch = []
+    for name in names:
+        if name in done:
+            continue
+        done.add(name)
+        batch.append(name)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _read_checkpoint(checkpoint, options):
+    """
+    Return the names a previous run already migrated
+    
+    Raises: ValueError if the checkpoint was written with other options
+    """
+    if not os.path.exists(checkpoint):
+        return set()
+    with open(checkpoint) as file:
+        header = file.readline()
+        if json.loads(header) != options:
+            raise ValueError(
+                f"Checkpoint {checkpoint} is for a migration with options {header.strip()}; "
+                "rerun with those options or delete it"
+            )
+        # a final line cut short by a crash has no newline and is ignored
+        return {line[:-1] for line in file if line.endswith("\n")}
+
+def _append_checkpoint(checkpoint, options, names):
+    """Record migrated names, writing the options header on first use"""
+    new_file = not os.path.exists(checkpoint)
+    with open(checkpoint, "a") as file:
+        if new_file:
+            file.write(json.dumps(options) + "\n")
+        file.write("".join(f"{name}\n" for name in names))
+        file.flush()
+        os.fsync(file.fileno())
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Migrate save files to a new schema, format or layout")
+    parser.add_argument("--save-dir", default="data/save_games")
+    parser.add_argument("--to-version", type=int, default=None, help="Default: latest transform")
+    parser.add_argument("--format", choices=["text", "binary"], default=None)
+    parser.add_argument("--layout", choices=list(character_manager.SAVE_LAYOUTS), default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--fsync", action="store_true", help="Flush every rewritten save to disk")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+    
+    try:
+        result = migrate_saves(args.save_dir, args.to_version, args.format, args.layout,
+                               args.workers, args.batch_size, args.dry_run, args.fsync)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    
+    print(f"{'Would migrate' if args.dry_run else 'Migrated'} {result['scanned']} saves "
+          f"from version {result['from_version']} to {result['to_version']} "
+          f"in {result['seconds']:.2f}s ({result['saves_per_second']:.0f} saves/sec)")
+    if result["resumed"]:
+        print(f"Skipped {result['resumed']} saves finished by an earlier run")
+    for version, description, _ in TRANSFORMS:
+        if version in result["changed"]:
+            print(f"  v{version} {description}: {result['changed'][version]} saves changed")
+    for name, error in sorted(result["failed"].items()):
+        print(f"Failed {name}: {error}")
+    return 1 if result["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Storage Migration
+
+Copies every character between the text-file save directory and a
+SQLite database.
+
+Usage:
+    python tools/migrate_storage.py to-sqlite [save_directory] [db_path]
+    python tools/migrate_storage.py to-text [db_path] [save_directory]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import character_store
+
+def main(argv):
+    if not argv or argv[0] not in ("to-sqlite", "to-text"):
+        print(__doc__)
+        return 2
+    
+    if argv[0] == "to-sqlite":
+        save_directory = argv[1] if len(argv) > 1 else "data/save_games"
+        db_path = argv[2] if len(argv) > 2 else "data/save_games.db"
+        source = character_manager.TextFileBackend(save_directory, fsync=False)
+        destination = character_store.SQLiteBackend(db_path)
+    else:
+        db_path = argv[1] if len(argv) > 1 else "data/save_games.db"
+        save_directory = argv[2] if len(argv) > 2 else "data/save_games"
+        source = character_store.SQLiteBackend(db_path)
+        destination = character_manager.TextFileBackend(save_directory)
+    
+    result = character_store.migrate_storage(source, destination)
+    print(f"Migrated {result['migrated']} characters")
+    for name, error in sorted(result['failed'].items()):
+        print(f"Skipped {name}: {error}")
+    return 1 if result['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,50 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Validator
+
+Checks quest/item data files with game_data.validate_catalog and prints
+every problem as "file:line: message". Exits with status 1 if any file
+has errors, so it can be used as a pre-commit hook.
+
+Whether a file holds quests or items is detected from its contents (or
+its name); --kind sets it for files where neither tells.
+
+Usage:
+    python tools/validate_catalog.py data/quests.txt data/items.txt
+    python tools/validate_catalog.py --kind item data/shop_stock.txt
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import DataError
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Report every problem in quest/item data files")
+    parser.add_argument("paths", nargs="+", metavar="FILE")
+    parser.add_argument("--kind", choices=["quest", "item"], default=None,
+                        help="Catalog kind of every file (default: detect)")
+    args = parser.parse_args(argv)
+    
+    failed = False
+    for path in args.paths:
+        try:
+            errors = game_data.validate_catalog(path, args.kind)
+        except (DataError, ValueError) as e:
+            print(f"{path}: {e}")
+            failed = True
+            continue
+        
+        for error in errors:
+            print(f"{path}:{error.line}: {error.message}")
+        if errors:
+            failed = True
+    
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))